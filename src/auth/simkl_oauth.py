@@ -3,14 +3,15 @@
 import http.server
 import json
 import logging
-import socketserver
+import os
 import threading
-import webbrowser
 from pathlib import Path
 from typing import Optional
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs, urlencode, urlparse
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
     """Handler for OAuth callback."""
 
     code: Optional[str] = None
+    error: Optional[str] = None
 
     def do_GET(self) -> None:
         """Handle GET request from OAuth callback."""
@@ -40,11 +42,15 @@ class OAuthCallbackHandler(http.server.BaseHTTPRequestHandler):
                     </body>
                     </html>
                 """)
+                self.server.code_received.set()
             else:
                 self.send_response(400)
                 self.send_header("Content-type", "text/html")
                 self.end_headers()
                 self.wfile.write(b"<html><body><h1>Error: No code received</h1></body></html>")
+                # Denied or cancelled: wake the waiter now instead of at the timeout
+                OAuthCallbackHandler.error = query.get("error", ["no code"])[0]
+                self.server.code_received.set()
         else:
             self.send_response(404)
             self.end_headers()
@@ -66,51 +72,102 @@ class SimklOAuth:
         self.token_file = token_file
         self.PORT = port
         self.REDIRECT_URI = f"http://localhost:{port}/callback"
-        self._access_token: Optional[str] = None
+        self._auth_url = f"{self.AUTH_URL}?" + urlencode({
+            "response_type": "code",
+            "client_id": client_id,
+            "redirect_uri": self.REDIRECT_URI,
+        })
+        self._access_token: Optional[str] = self._load_token()
         self._last_error: Optional[str] = None
 
+        self._session: Optional[requests.Session] = None
+
     @property
     def access_token(self) -> Optional[str]:
         """Get the current access token, loading from file if needed."""
-        if self._access_token:
-            return self._access_token
+        if not self._access_token:
+            # The token file may have been written by another instance since
+            self._access_token = self._load_token()
+        return self._access_token
 
+    def _load_token(self) -> Optional[str]:
+        """Read the access token from the token file, if present."""
         if self.token_file.exists():
             try:
                 data = json.loads(self.token_file.read_text())
-                self._access_token = data.get("access_token")
-                return self._access_token
+                return data.get("access_token")
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Failed to load token file: {e}")
 
         return None
 
     def save_token(self, access_token: str) -> None:
-        """Save the access token to file."""
+        """Save the access token to file atomically."""
         self._access_token = access_token
-        self.token_file.write_text(json.dumps({"access_token": access_token}))
+        payload = json.dumps({"access_token": access_token}, separators=(",", ":"))
+        tmp_file = self.token_file.with_name(self.token_file.name + ".tmp")
+        tmp_file.write_text(payload)
+        try:
+            os.replace(tmp_file, self.token_file)
+        except OSError:
+            # A bind-mounted token file (see docker-compose.yml) cannot be renamed over
+            tmp_file.unlink(missing_ok=True)
+            self.token_file.write_text(payload)
         logger.info(f"Token saved to {self.token_file}")
 
+    def _get_session(self) -> requests.Session:
+        """
+        Get the HTTP session for token calls, creating it on first use.
+
+        One connection pool is reused for token exchange and refresh calls;
+        runs with a cached token never need it.
+        """
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        return self._session
+
     def get_auth_url(self) -> str:
         """Get the authorization URL without opening browser."""
-        return f"{self.AUTH_URL}?response_type=code&client_id={self.client_id}&redirect_uri={self.REDIRECT_URI}"
+        return self._auth_url
+
+    def _create_server(self) -> http.server.ThreadingHTTPServer:
+        """
+        Create the callback server.
+
+        Threaded so that speculative connections and favicon requests from
+        the browser cannot hold up the real /callback request.
+        """
+        server = http.server.ThreadingHTTPServer(("", self.PORT), OAuthCallbackHandler)
+        server.daemon_threads = True
+        server.code_received = threading.Event()
+        return server
 
     def start_callback_server(self) -> None:
         """Start the OAuth callback server in a background thread."""
         OAuthCallbackHandler.code = None
-        self._server = socketserver.TCPServer(("", self.PORT), OAuthCallbackHandler)
-        self._server_thread = threading.Thread(target=self._server.handle_request)
+        OAuthCallbackHandler.error = None
+        self._server = self._create_server()
+        self._server_thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.1}
+        )
         self._server_thread.daemon = True
         self._server_thread.start()
         logger.info(f"OAuth callback server started on port {self.PORT}")
 
     def wait_for_callback(self, timeout: int = 300) -> Optional[str]:
         """Wait for OAuth callback and exchange code for token."""
-        self._server_thread.join(timeout=timeout)
+        received = self._server.code_received.wait(timeout=timeout)
+        self._server.shutdown()
         self._server.server_close()
         if not OAuthCallbackHandler.code:
-            self._last_error = "Aucun code reçu — autorisation annulée ou délai dépassé (5 min)"
-            logger.error("No authorization code received (timeout or cancelled)")
+            if received:
+                # The callback came back without a code: denied or cancelled
+                self._last_error = f"Autorisation refusée par Simkl ({OAuthCallbackHandler.error})"
+                logger.error(f"Authorization denied: {OAuthCallbackHandler.error}")
+            else:
+                self._last_error = f"Aucun code reçu — délai dépassé ({timeout // 60} min)"
+                logger.error("No authorization code received (timeout)")
             return None
         token = self._exchange_code(OAuthCallbackHandler.code)
         if not token and not self._last_error:
@@ -130,34 +187,22 @@ class SimklOAuth:
         logger.info("Starting OAuth authentication flow...")
 
         # Start local server
-        OAuthCallbackHandler.code = None
-        server = socketserver.TCPServer(("", self.PORT), OAuthCallbackHandler)
-        server_thread = threading.Thread(target=server.handle_request)
-        server_thread.daemon = True
-        server_thread.start()
+        self.start_callback_server()
 
-        # Open browser for authorization
-        auth_url = f"{self.AUTH_URL}?response_type=code&client_id={self.client_id}&redirect_uri={self.REDIRECT_URI}"
-        logger.info(f"Opening browser for authentication...")
-        webbrowser.open(auth_url)
-
-        # Wait for callback
-        print("Waiting for authentication... Please authorize in your browser.")
-        server_thread.join(timeout=120)  # 2 minute timeout
+        # Open browser for authorization (only needed here, so imported lazily)
+        import webbrowser
 
-        server.server_close()
+        logger.info("Opening browser for authentication...")
+        webbrowser.open(self.get_auth_url())
 
-        if not OAuthCallbackHandler.code:
-            logger.error("No authorization code received")
-            return None
-
-        # Exchange code for token
-        return self._exchange_code(OAuthCallbackHandler.code)
+        # Wait for callback and exchange code for token
+        print("Waiting for authentication... Please authorize in your browser.")
+        return self.wait_for_callback(timeout=120)  # 2 minute timeout
 
     def _exchange_code(self, code: str) -> Optional[str]:
         """Exchange authorization code for access token."""
         try:
-            response = requests.post(
+            response = self._get_session().post(
                 self.TOKEN_URL,
                 json={
                     "code": code,
@@ -168,7 +213,7 @@ class SimklOAuth:
                 },
                 timeout=30,
             )
-            data = response.json()
+            data = orjson.loads(response.content)
 
             if not response.ok:
                 self._last_error = f"Simkl a rejeté la requête: {data.get('message', data)}"
@@ -185,7 +230,7 @@ class SimklOAuth:
                 logger.error(f"No access token in response: {data}")
                 return None
 
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             self._last_error = f"Erreur réseau lors de l'échange: {e}"
             logger.error(f"Failed to exchange code for token: {e}")
             return None
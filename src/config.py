@@ -13,6 +13,11 @@ def _env(key: str, default: str = "") -> str:
     return os.getenv(key, default).split("#")[0].strip()
 
 
+def _env_bool(key: str, default: bool) -> bool:
+    """Get a boolean env value ("true"/"false", case-insensitive)."""
+    return _env(key, "true" if default else "false").lower() == "true"
+
+
 class Config:
     """Application configuration."""
 
@@ -35,13 +40,16 @@ class Config:
 
     # TMDB
     TMDB_API_KEY: str = os.getenv("TMDB_API_KEY", "")
+    TMDB_CONCURRENCY: int = int(_env("TMDB_CONCURRENCY", "8"))
 
     # Options
-    EXPORT_RATINGS: bool = _env("EXPORT_RATINGS", "true").lower() == "true"
-    EXPORT_WATCHLIST: bool = _env("EXPORT_WATCHLIST", "true").lower() == "true"
-    EXPORT_WATCHED: bool = _env("EXPORT_WATCHED", "true").lower() == "true"
-    SKIP_SERIES: bool = _env("SKIP_SERIES", "true").lower() == "true"
+    EXPORT_RATINGS: bool = _env_bool("EXPORT_RATINGS", True)
+    EXPORT_WATCHLIST: bool = _env_bool("EXPORT_WATCHLIST", True)
+    EXPORT_WATCHED: bool = _env_bool("EXPORT_WATCHED", True)
+    SKIP_SERIES: bool = _env_bool("SKIP_SERIES", True)
     OUTPUT_DIR: Path = Path(os.getenv("OUTPUT_DIR", "./output"))
+    # TMDB lookups shared by CLI runs and web syncs
+    ENRICHMENT_CACHE_FILE: Path = OUTPUT_DIR / "enrichment_cache.json"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
     # Web interface
@@ -1,51 +1,116 @@
 """TMDB API client for movie enrichment and validation."""
 
 import logging
+import os
+import threading
 import time
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterable, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.models import Movie
 
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second."""
+
+    def __init__(self, rate: float = 40.0, capacity: int = 40):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                # Releases the lock while waiting so other callers can refill too
+                self._cond.wait((1 - self.tokens) / self.rate)
+
+
 class TMDBClient:
     """Client for The Movie Database API."""
 
     BASE_URL = "https://api.themoviedb.org/3"
-    RATE_LIMIT_DELAY = 0.25  # 4 requests per second max
+    RATE_LIMIT = 40.0  # Requests per second, shared by all threads
+    CACHE_TTL = 86400  # Seconds a successful response is reused
+    CACHE_SIZE = 8192  # Responses kept at most; the least recently used go first
+    MEMO_SIZE = 50000  # Enrichment results kept (and persisted) at most
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_workers: int = 8):
         self.api_key = api_key
+        self.max_workers = max_workers
         self.session = requests.Session()
-        self._last_request_time = 0.0
+        self.session.params = {"api_key": api_key}
+
+        # Keep connections to TMDB alive and let urllib3 retry 429/5xx with backoff
+        retry = Retry(
+            total=5,
+            backoff_factor=0.25,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self.session.mount("https://", adapter)
+
+        self._rate_limiter = RateLimiter(rate=self.RATE_LIMIT, capacity=int(self.RATE_LIMIT))
+        self._cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._memo: OrderedDict[tuple, Movie] = OrderedDict()
+        self._memo_lock = threading.Lock()
 
-    def _rate_limit(self) -> None:
-        """Ensure we don't exceed rate limits."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - elapsed)
-        self._last_request_time = time.time()
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
 
     def _get(self, endpoint: str, params: Optional[dict] = None) -> Optional[dict]:
-        """Make a GET request to TMDB API."""
-        self._rate_limit()
+        """Make a GET request to TMDB API, reusing recent identical responses."""
+        cache_key = (endpoint, tuple(sorted(params.items())) if params else ())
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                self._cache.move_to_end(cache_key)
+                return cached[1]
+
+        self._rate_limiter.acquire()
 
         url = f"{self.BASE_URL}{endpoint}"
-        request_params = {"api_key": self.api_key}
-        if params:
-            request_params.update(params)
 
         try:
-            response = self.session.get(url, params=request_params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            logger.error(f"TMDB API error for {endpoint}: {e}")
+            response = self.session.get(url, params=params, timeout=10)
+            if not response.ok:
+                logger.error("TMDB API error for %s: HTTP %s", endpoint, response.status_code)
+                return None
+            data = orjson.loads(response.content)
+            self._store(cache_key, data)
+            return data
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            logger.error("TMDB API error for %s: %s", endpoint, e)
             return None
 
+    def _store(self, cache_key: tuple, data: dict) -> None:
+        """Cache a response, evicting the least recently used once full."""
+        with self._cache_lock:
+            self._cache[cache_key] = (time.monotonic() + self.CACHE_TTL, data)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+
     def get_movie_details(self, tmdb_id: int) -> Optional[dict]:
         """Get movie details including external IDs."""
         data = self._get(f"/movie/{tmdb_id}", {"append_to_response": "external_ids,credits"})
@@ -74,22 +139,108 @@ class TMDBClient:
             return data.get("results", [])
         return []
 
+    @staticmethod
+    def _memo_key(movie: Movie) -> tuple:
+        """Key enrichment results by everything enrich_movie reads from its input."""
+        return (movie.tmdb_id, movie.imdb_id, movie.title, movie.year, tuple(movie.directors))
+
+    @staticmethod
+    def _copy_movie(movie: Movie) -> Movie:
+        """Copy a movie so callers never share mutable state with the memo."""
+        return Movie(
+            title=movie.title,
+            year=movie.year,
+            tmdb_id=movie.tmdb_id,
+            imdb_id=movie.imdb_id,
+            directors=movie.directors.copy(),
+            poster_path=movie.poster_path,
+        )
+
+    def load_cache(self, path: Path) -> None:
+        """Load enrichment results saved by a previous run."""
+        if not path.exists():
+            return
+
+        try:
+            for key, data in orjson.loads(path.read_bytes()):
+                tmdb_id, imdb_id, title, year, directors = key
+                self._memo[(tmdb_id, imdb_id, title, year, tuple(directors))] = Movie(**data)
+            # Saved least recently used first, so trimming keeps the newest
+            while len(self._memo) > self.MEMO_SIZE:
+                self._memo.popitem(last=False)
+            logger.info(f"Loaded {len(self._memo)} cached enrichments from {path}")
+        except (OSError, orjson.JSONDecodeError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable enrichment cache {path}: {e}")
+            self._memo.clear()
+
+    def save_cache(self, path: Path) -> None:
+        """Persist enrichment results so the next run can skip them."""
+        with self._memo_lock:
+            memo = list(self._memo.items())
+        entries = [
+            (
+                key,
+                {
+                    "title": m.title,
+                    "year": m.year,
+                    "tmdb_id": m.tmdb_id,
+                    "imdb_id": m.imdb_id,
+                    "directors": m.directors,
+                    "poster_path": m.poster_path,
+                },
+            )
+            for key, m in memo
+        ]
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            # The web app never runs the exporter, which creates OUTPUT_DIR
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(orjson.dumps(entries))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # A failed write only costs TMDB requests on the next run
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not save enrichment cache to {path}: {e}")
+            return
+        logger.debug(f"Saved {len(entries)} cached enrichments to {path}")
+
     def enrich_movie(self, movie: Movie) -> Movie:
         """
         Enrich a movie with TMDB and IMDB IDs.
 
+        Results that resolved both IDs are memoized per input, so a movie
+        seen earlier in this run (or a loaded cache) costs no request.
+        """
+        key = self._memo_key(movie)
+        with self._memo_lock:
+            cached = self._memo.get(key)
+            if cached:
+                self._memo.move_to_end(key)
+                return self._copy_movie(cached)
+
+        enriched = self._enrich(movie)
+        if enriched.tmdb_id and enriched.imdb_id:
+            with self._memo_lock:
+                self._memo[key] = self._copy_movie(enriched)
+                self._memo.move_to_end(key)
+                if len(self._memo) > self.MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        return enriched
+
+    def _enrich(self, movie: Movie) -> Movie:
+        """
+        Look up a movie on TMDB.
+
         Strategy:
         1. If TMDB ID present -> get external IDs
         2. If IMDB ID present but no TMDB -> find by IMDB
         3. If no IDs -> search by title+year
         """
-        enriched = Movie(
-            title=movie.title,
-            year=movie.year,
-            tmdb_id=movie.tmdb_id,
-            imdb_id=movie.imdb_id,
-            directors=movie.directors.copy(),
-        )
+        enriched = self._copy_movie(movie)
+
+        # Nothing left to look up
+        if enriched.tmdb_id and enriched.imdb_id and enriched.directors and enriched.year:
+            return enriched
 
         # Strategy 1: We have TMDB ID
         if enriched.tmdb_id:
@@ -101,20 +252,15 @@ class TMDBClient:
 
                 # Get directors if not present
                 if not enriched.directors:
-                    credits = details.get("credits", {})
-                    crew = credits.get("crew", [])
-                    enriched.directors = [
-                        p["name"] for p in crew if p.get("job") == "Director"
-                    ]
+                    enriched.directors = self._extract_directors(details)
 
                 # Update year if not present
-                if not enriched.year and details.get("release_date"):
-                    try:
-                        enriched.year = int(details["release_date"][:4])
-                    except (ValueError, TypeError):
-                        pass
+                if not enriched.year:
+                    enriched.year = self._release_year(details)
+
+                enriched.poster_path = enriched.poster_path or details.get("poster_path")
 
-                logger.debug(f"Enriched '{movie.title}' via TMDB ID {enriched.tmdb_id}")
+                logger.debug("Enriched '%s' via TMDB ID %s", movie.title, enriched.tmdb_id)
                 return enriched
 
         # Strategy 2: We have IMDB ID but no TMDB ID
@@ -122,22 +268,16 @@ class TMDBClient:
             result = self.find_by_imdb_id(enriched.imdb_id)
             if result:
                 enriched.tmdb_id = result.get("id")
-                if not enriched.year and result.get("release_date"):
-                    try:
-                        enriched.year = int(result["release_date"][:4])
-                    except (ValueError, TypeError):
-                        pass
-                logger.debug(f"Found TMDB ID {enriched.tmdb_id} for IMDB {enriched.imdb_id}")
-
-                # Now get full details including directors
-                if enriched.tmdb_id:
+                if not enriched.year:
+                    enriched.year = self._release_year(result)
+                enriched.poster_path = enriched.poster_path or result.get("poster_path")
+                logger.debug("Found TMDB ID %s for IMDB %s", enriched.tmdb_id, enriched.imdb_id)
+
+                # Now get full details including directors, unless we have them
+                if enriched.tmdb_id and not enriched.directors:
                     details = self.get_movie_details(enriched.tmdb_id)
-                    if details and not enriched.directors:
-                        credits = details.get("credits", {})
-                        crew = credits.get("crew", [])
-                        enriched.directors = [
-                            p["name"] for p in crew if p.get("job") == "Director"
-                        ]
+                    if details:
+                        enriched.directors = self._extract_directors(details)
                 return enriched
 
         # Strategy 3: Search by title and year
@@ -149,77 +289,125 @@ class TMDBClient:
                 best_match = self._find_best_match(results, enriched.title, enriched.year)
                 if best_match:
                     enriched.tmdb_id = best_match.get("id")
-                    if not enriched.year and best_match.get("release_date"):
-                        try:
-                            enriched.year = int(best_match["release_date"][:4])
-                        except (ValueError, TypeError):
-                            pass
+                    if not enriched.year:
+                        enriched.year = self._release_year(best_match)
+                    enriched.poster_path = enriched.poster_path or best_match.get("poster_path")
 
-                    # Get external IDs
+                    # Details already embed external IDs and credits
                     if enriched.tmdb_id:
-                        external_ids = self.get_external_ids(enriched.tmdb_id)
-                        if external_ids and external_ids.get("imdb_id"):
-                            enriched.imdb_id = external_ids["imdb_id"]
-
-                        # Get directors
                         details = self.get_movie_details(enriched.tmdb_id)
-                        if details and not enriched.directors:
-                            credits = details.get("credits", {})
-                            crew = credits.get("crew", [])
-                            enriched.directors = [
-                                p["name"] for p in crew if p.get("job") == "Director"
-                            ]
-
-                    logger.debug(f"Found '{movie.title}' via search: TMDB {enriched.tmdb_id}")
+                        if details:
+                            external_ids = details.get("external_ids", {})
+                            if external_ids.get("imdb_id"):
+                                enriched.imdb_id = external_ids["imdb_id"]
+
+                            if not enriched.directors:
+                                enriched.directors = self._extract_directors(details)
+
+                    logger.debug("Found '%s' via search: TMDB %s", movie.title, enriched.tmdb_id)
                     return enriched
 
-            logger.warning(f"Could not find '{movie.title}' ({movie.year}) on TMDB")
+            logger.warning("Could not find '%s' (%s) on TMDB", movie.title, movie.year)
 
         return enriched
 
+    def enrich_many(
+        self,
+        movies: Iterable[Movie],
+        workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> list[Movie]:
+        """
+        Enrich several movies concurrently.
+
+        Results are returned in the same order as the input. The rate limit
+        is shared across workers, so this only overlaps network latency.
+        on_progress, if given, is called as (done, total) after each movie.
+
+        IMDB-only movies are resolved in a first wave of /find requests, so
+        the second wave of per-movie enrichment finds them in the cache and
+        goes straight to the details call.
+
+        Identical inputs (rewatches, repeated history rows) are enriched
+        once; concurrent duplicates would otherwise all miss the memo.
+        """
+        movies = list(movies)
+        keys = [self._memo_key(m) for m in movies]
+        unique = dict(zip(keys, movies))
+        imdb_only = {m.imdb_id for m in unique.values() if m.imdb_id and not m.tmdb_id}
+
+        with ThreadPoolExecutor(max_workers=workers or self.max_workers) as executor:
+            if imdb_only:
+                list(executor.map(self.find_by_imdb_id, imdb_only))
+
+            futures = {key: executor.submit(self.enrich_movie, m) for key, m in unique.items()}
+            if on_progress:
+                for done, _ in enumerate(as_completed(futures.values()), 1):
+                    on_progress(done, len(futures))
+
+        # Each entry gets its own copy so later edits to one don't leak into another
+        seen = set()
+        results = []
+        for key in keys:
+            enriched = futures[key].result()
+            results.append(self._copy_movie(enriched) if key in seen else enriched)
+            seen.add(key)
+        return results
+
+    @staticmethod
+    def _extract_directors(details: dict) -> list[str]:
+        """Get director names from a details payload with appended credits."""
+        return [
+            p["name"]
+            for p in details.get("credits", {}).get("crew", ())
+            if p.get("job") == "Director"
+        ]
+
+    @staticmethod
+    def _release_year(data: dict) -> Optional[int]:
+        """Parse the year out of a TMDB release_date, if any."""
+        release_date = data.get("release_date")
+        if release_date:
+            try:
+                return int(release_date[:4])
+            except (ValueError, TypeError):
+                pass
+        return None
+
     def _find_best_match(
         self, results: list[dict], title: str, year: Optional[int]
     ) -> Optional[dict]:
-        """Find the best matching result from search results."""
+        """
+        Find the best matching result from search results.
+
+        Preference order, in a single pass: exact title with matching year,
+        exact title, matching year, then the first result.
+        """
         if not results:
             return None
 
         title_lower = title.lower()
+        title_match = None
+        year_match = None
 
         for result in results:
-            result_title = result.get("title", "").lower()
-            result_original_title = result.get("original_title", "").lower()
-            result_year = None
-
-            if result.get("release_date"):
-                try:
-                    result_year = int(result["release_date"][:4])
-                except (ValueError, TypeError):
-                    pass
-
-            # Exact title match with year
-            if year and result_year:
-                if (result_title == title_lower or result_original_title == title_lower) and result_year == year:
+            result_year = self._release_year(result)
+            is_title_match = (
+                result.get("title", "").lower() == title_lower
+                or result.get("original_title", "").lower() == title_lower
+            )
+
+            if is_title_match:
+                # Without a year to compare, the first exact title wins
+                if not year or result_year == year:
                     return result
+                if title_match is None:
+                    title_match = result
+            elif year and year_match is None and result_year == year:
+                year_match = result
 
-            # Exact title match without year constraint
-            if result_title == title_lower or result_original_title == title_lower:
-                return result
-
-        # If no exact match, return the first result if year matches
-        if year:
-            for result in results:
-                if result.get("release_date"):
-                    try:
-                        result_year = int(result["release_date"][:4])
-                        if result_year == year:
-                            return result
-                    except (ValueError, TypeError):
-                        pass
-
-        # Return first result as fallback
-        return results[0] if results else None
+        return title_match or year_match or results[0]
 
     def validate_movie(self, movie: Movie) -> bool:
         """Check if a movie has valid IDs."""
-        return bool(movie.tmdb_id or movie.imdb_id)
+        return movie.has_id
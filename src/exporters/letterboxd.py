@@ -2,14 +2,25 @@
 
 import csv
 import logging
+from contextlib import ExitStack
 from datetime import date
 from pathlib import Path
-from typing import List
+from typing import Iterable
 
 from src.models import Movie, WatchEntry, WatchlistEntry
 
 logger = logging.getLogger(__name__)
 
+# csv.writer's default dialect terminates rows with CRLF; keep the same bytes
+LINE_END = "\r\n"
+
+
+def _csv_escape(value: str) -> str:
+    """Quote a free-text CSV field exactly as csv.writer would (QUOTE_MINIMAL)."""
+    if "," in value or '"' in value or "\n" in value or "\r" in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
 
 class LetterboxdExporter:
     """Export movies to Letterboxd-compatible CSV format."""
@@ -35,184 +46,180 @@ class LetterboxdExporter:
         "Directors",
     ]
 
+    # Header lines are fixed, so they are encoded once
+    WATCHED_HEADER_LINE = (",".join(WATCHED_HEADERS) + LINE_END).encode("utf-8")
+    WATCHLIST_HEADER_LINE = (",".join(WATCHLIST_HEADERS) + LINE_END).encode("utf-8")
+
+    NOT_FOUND_WATCHED_HEADERS = ["Title", "Year", "WatchedDate", "Rating", "Reason"]
+    NOT_FOUND_WATCHLIST_HEADERS = ["Title", "Year", "AddedDate", "Reason"]
+
+    WRITE_BUFFER_SIZE = 1 << 20  # Fewer write syscalls on large exports
+
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def export_watched(
-        self, entries: List[WatchEntry], filename: str = "letterboxd_watched.csv"
+        self, entries: Iterable[WatchEntry], filename: str = "letterboxd_watched.csv"
     ) -> Path:
         """
         Export watched movies to CSV.
 
         Args:
-            entries: List of WatchEntry objects
+            entries: WatchEntry objects; consumed in a single pass
             filename: Output filename
 
         Returns:
             Path to the created CSV file
         """
         output_path = self.output_dir / filename
-        valid_entries = []
-        not_found = []
-
-        for entry in entries:
-            if entry.movie.tmdb_id or entry.movie.imdb_id:
-                valid_entries.append(entry)
-            else:
-                not_found.append(entry)
-
-        # Write main CSV
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(self.WATCHED_HEADERS)
+        not_found_path = self.output_dir / "not_found_watched.csv"
+        exported = 0
+        not_found = 0
+
+        # Single pass: matched entries go to the main CSV, the rest to a
+        # not-found report that is only created on the first miss
+        with ExitStack() as stack:
+            f = stack.enter_context(open(output_path, "wb", buffering=self.WRITE_BUFFER_SIZE))
+            # Rows are pre-escaped lines, so no csv.writer is needed here
+            f.write(self.WATCHED_HEADER_LINE)
+            not_found_writer = None
 
-            for entry in valid_entries:
-                row = self._format_watched_row(entry)
-                writer.writerow(row)
-
-        logger.info(f"Exported {len(valid_entries)} watched movies to {output_path}")
+            for entry in entries:
+                if entry.movie.has_id:
+                    f.write(self._format_watched_row(entry).encode("utf-8"))
+                    exported += 1
+                else:
+                    if not_found_writer is None:
+                        not_found_writer = self._open_not_found(
+                            stack, not_found_path, self.NOT_FOUND_WATCHED_HEADERS
+                        )
+                    not_found_writer.writerow(self._format_not_found_watched_row(entry))
+                    not_found += 1
+
+        logger.info(f"Exported {exported} watched movies to {output_path}")
 
-        # Write not found movies
         if not_found:
-            self._export_not_found(not_found, "not_found_watched.csv")
+            logger.warning(
+                f"{not_found} watched movies could not be matched. "
+                f"See {not_found_path}"
+            )
 
         return output_path
 
     def export_watchlist(
-        self, entries: List[WatchlistEntry], filename: str = "letterboxd_watchlist.csv"
+        self, entries: Iterable[WatchlistEntry], filename: str = "letterboxd_watchlist.csv"
     ) -> Path:
         """
         Export watchlist to CSV.
 
         Args:
-            entries: List of WatchlistEntry objects
+            entries: WatchlistEntry objects; consumed in a single pass
             filename: Output filename
 
         Returns:
             Path to the created CSV file
         """
         output_path = self.output_dir / filename
-        valid_entries = []
-        not_found = []
-
-        for entry in entries:
-            if entry.movie.tmdb_id or entry.movie.imdb_id:
-                valid_entries.append(entry)
-            else:
-                not_found.append(entry)
-
-        # Write main CSV
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(self.WATCHLIST_HEADERS)
+        not_found_path = self.output_dir / "not_found_watchlist.csv"
+        exported = 0
+        not_found = 0
+
+        # Single pass: matched entries go to the main CSV, the rest to a
+        # not-found report that is only created on the first miss
+        with ExitStack() as stack:
+            f = stack.enter_context(open(output_path, "wb", buffering=self.WRITE_BUFFER_SIZE))
+            # Rows are pre-escaped lines, so no csv.writer is needed here
+            f.write(self.WATCHLIST_HEADER_LINE)
+            not_found_writer = None
 
-            for entry in valid_entries:
-                row = self._format_watchlist_row(entry)
-                writer.writerow(row)
-
-        logger.info(f"Exported {len(valid_entries)} watchlist movies to {output_path}")
+            for entry in entries:
+                if entry.movie.has_id:
+                    f.write(self._format_watchlist_row(entry).encode("utf-8"))
+                    exported += 1
+                else:
+                    if not_found_writer is None:
+                        not_found_writer = self._open_not_found(
+                            stack, not_found_path, self.NOT_FOUND_WATCHLIST_HEADERS
+                        )
+                    not_found_writer.writerow(self._format_not_found_watchlist_row(entry))
+                    not_found += 1
+
+        logger.info(f"Exported {exported} watchlist movies to {output_path}")
 
-        # Write not found movies
         if not_found:
-            self._export_not_found_watchlist(not_found, "not_found_watchlist.csv")
+            logger.warning(
+                f"{not_found} watchlist movies could not be matched. "
+                f"See {not_found_path}"
+            )
 
         return output_path
 
-    def _format_watched_row(self, entry: WatchEntry) -> list:
-        """Format a WatchEntry as a CSV row."""
+    def _format_watched_row(self, entry: WatchEntry) -> str:
+        """Format a WatchEntry as a CSV line."""
+        # Read every attribute once; this runs for each exported row
         movie = entry.movie
-
-        # Format rating (0.5-5 scale, or empty)
-        rating_str = ""
-        if entry.rating is not None:
-            rating_str = str(entry.rating)
-
-        # Format date
-        date_str = ""
-        if entry.watched_date:
-            date_str = entry.watched_date.isoformat()
-
-        # Format directors
-        directors_str = ", ".join(movie.directors) if movie.directors else ""
-
-        # Format rewatch
-        rewatch_str = "true" if entry.rewatch else "false"
-
-        # Format tags
-        tags_str = ", ".join(entry.tags) if entry.tags else ""
-
-        return [
-            movie.imdb_id or "",
-            str(movie.tmdb_id) if movie.tmdb_id else "",
-            movie.title,
-            str(movie.year) if movie.year else "",
-            directors_str,
-            date_str,
-            rating_str,
-            rewatch_str,
-            tags_str,
-            entry.review or "",
-        ]
-
-    def _format_watchlist_row(self, entry: WatchlistEntry) -> list:
-        """Format a WatchlistEntry as a CSV row."""
+        imdb_id = movie.imdb_id
+        tmdb_id = movie.tmdb_id
+        year = movie.year
+        directors = movie.directors
+        rating = entry.rating
+        watched_date = entry.watched_date
+        tags = entry.tags
+
+        # Only the free-text fields can contain separators or quotes
+        return ",".join((
+            imdb_id or "",
+            str(tmdb_id) if tmdb_id else "",
+            _csv_escape(movie.title),
+            str(year) if year else "",
+            _csv_escape(", ".join(directors)) if directors else "",
+            watched_date.isoformat() if watched_date else "",
+            str(rating) if rating is not None else "",  # 0.5-5 scale
+            "true" if entry.rewatch else "false",
+            _csv_escape(", ".join(tags)) if tags else "",
+            _csv_escape(entry.review or ""),
+        )) + LINE_END
+
+    def _format_watchlist_row(self, entry: WatchlistEntry) -> str:
+        """Format a WatchlistEntry as a CSV line."""
         movie = entry.movie
+        tmdb_id = movie.tmdb_id
+        year = movie.year
+        directors = movie.directors
 
-        # Format directors
-        directors_str = ", ".join(movie.directors) if movie.directors else ""
-
-        return [
+        return ",".join((
             movie.imdb_id or "",
-            str(movie.tmdb_id) if movie.tmdb_id else "",
-            movie.title,
-            str(movie.year) if movie.year else "",
-            directors_str,
-        ]
-
-    def _export_not_found(
-        self, entries: List[WatchEntry], filename: str
-    ) -> None:
-        """Export entries that couldn't be matched to a separate CSV."""
-        output_path = self.output_dir / filename
-
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Title", "Year", "WatchedDate", "Rating", "Reason"])
-
-            for entry in entries:
-                writer.writerow([
-                    entry.movie.title,
-                    entry.movie.year or "",
-                    entry.watched_date.isoformat() if entry.watched_date else "",
-                    entry.rating or "",
-                    "No TMDB/IMDB ID found",
-                ])
-
-        logger.warning(
-            f"{len(entries)} watched movies could not be matched. "
-            f"See {output_path}"
+            str(tmdb_id) if tmdb_id else "",
+            _csv_escape(movie.title),
+            str(year) if year else "",
+            _csv_escape(", ".join(directors)) if directors else "",
+        )) + LINE_END
+
+    def _open_not_found(self, stack: ExitStack, path: Path, headers: list[str]):
+        """Open a not-found report on the given stack and write its header."""
+        f = stack.enter_context(
+            open(path, "w", newline="", encoding="utf-8", buffering=self.WRITE_BUFFER_SIZE)
+        )
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        return writer
+
+    def _format_not_found_watched_row(self, entry: WatchEntry) -> tuple:
+        """Format an unmatched WatchEntry for the not-found report."""
+        return (
+            entry.movie.title,
+            entry.movie.year or "",
+            entry.watched_date.isoformat() if entry.watched_date else "",
+            entry.rating or "",
+            "No TMDB/IMDB ID found",
         )
 
-    def _export_not_found_watchlist(
-        self, entries: List[WatchlistEntry], filename: str
-    ) -> None:
-        """Export watchlist entries that couldn't be matched."""
-        output_path = self.output_dir / filename
-
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Title", "Year", "AddedDate", "Reason"])
-
-            for entry in entries:
-                writer.writerow([
-                    entry.movie.title,
-                    entry.movie.year or "",
-                    entry.added_date.isoformat() if entry.added_date else "",
-                    "No TMDB/IMDB ID found",
-                ])
-
-        logger.warning(
-            f"{len(entries)} watchlist movies could not be matched. "
-            f"See {output_path}"
+    def _format_not_found_watchlist_row(self, entry: WatchlistEntry) -> tuple:
+        """Format an unmatched WatchlistEntry for the not-found report."""
+        return (
+            entry.movie.title,
+            entry.movie.year or "",
+            entry.added_date.isoformat() if entry.added_date else "",
+            "No TMDB/IMDB ID found",
         )
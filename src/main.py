@@ -3,6 +3,7 @@
 import argparse
 import logging
 import sys
+from contextlib import ExitStack, closing
 from datetime import datetime
 from pathlib import Path
 from typing import List
@@ -65,13 +66,14 @@ def enrich_entries(
     tmdb_client: TMDBClient,
     logger: logging.Logger,
 ) -> None:
-    """Enrich movie entries with TMDB data."""
-    total = len(entries)
-    for i, entry in enumerate(entries, 1):
-        if i % 10 == 0 or i == total:
-            logger.info(f"Enriching movies: {i}/{total}")
+    """Enrich movie entries with TMDB data, several requests at a time."""
+    def report(done: int, total: int) -> None:
+        if done % 10 == 0 or done == total:
+            logger.info("Enriching movies: %d/%d", done, total)
 
-        entry.movie = tmdb_client.enrich_movie(entry.movie)
+    movies = tmdb_client.enrich_many((entry.movie for entry in entries), on_progress=report)
+    for entry, movie in zip(entries, movies):
+        entry.movie = movie
 
 
 def main() -> int:
@@ -126,45 +128,54 @@ def main() -> int:
         logger.error(str(e))
         return 1
 
-    # Test connection
-    if not source.test_connection():
-        logger.error(f"Failed to connect to {source.name}")
-        return 1
+    # Sessions are closed on every exit path
+    with ExitStack() as stack:
+        stack.enter_context(closing(source))
+
+        # Test connection
+        if not source.test_connection():
+            logger.error(f"Failed to connect to {source.name}")
+            return 1
 
-    tmdb_client = TMDBClient(Config.TMDB_API_KEY)
-    exporter = LetterboxdExporter(Config.OUTPUT_DIR)
-
-    # Export watched movies
-    export_watched = Config.EXPORT_WATCHED and not args.no_watched
-    if export_watched:
-        logger.info("")
-        logger.info("Fetching watched movies...")
-        watched = source.get_watched()
-
-        if watched:
-            logger.info(f"Enriching {len(watched)} watched movies with TMDB data...")
-            enrich_entries(watched, tmdb_client, logger)
-
-            output_file = exporter.export_watched(watched)
-            logger.info(f"Watched movies exported to: {output_file}")
-        else:
-            logger.warning("No watched movies found")
-
-    # Export watchlist
-    export_watchlist = Config.EXPORT_WATCHLIST and not args.no_watchlist
-    if export_watchlist:
-        logger.info("")
-        logger.info("Fetching watchlist...")
-        watchlist = source.get_watchlist()
-
-        if watchlist:
-            logger.info(f"Enriching {len(watchlist)} watchlist movies with TMDB data...")
-            enrich_entries(watchlist, tmdb_client, logger)
-
-            output_file = exporter.export_watchlist(watchlist)
-            logger.info(f"Watchlist exported to: {output_file}")
-        else:
-            logger.info("No watchlist items found")
+        tmdb_client = stack.enter_context(
+            closing(TMDBClient(Config.TMDB_API_KEY, max_workers=Config.TMDB_CONCURRENCY))
+        )
+        tmdb_client.load_cache(Config.ENRICHMENT_CACHE_FILE)
+        exporter = LetterboxdExporter(Config.OUTPUT_DIR)
+
+        # Export watched movies
+        export_watched = Config.EXPORT_WATCHED and not args.no_watched
+        if export_watched:
+            logger.info("")
+            logger.info("Fetching watched movies...")
+            watched = source.get_watched()
+
+            if watched:
+                logger.info(f"Enriching {len(watched)} watched movies with TMDB data...")
+                enrich_entries(watched, tmdb_client, logger)
+
+                output_file = exporter.export_watched(watched)
+                logger.info(f"Watched movies exported to: {output_file}")
+            else:
+                logger.warning("No watched movies found")
+
+        # Export watchlist
+        export_watchlist = Config.EXPORT_WATCHLIST and not args.no_watchlist
+        if export_watchlist:
+            logger.info("")
+            logger.info("Fetching watchlist...")
+            watchlist = source.get_watchlist()
+
+            if watchlist:
+                logger.info(f"Enriching {len(watchlist)} watchlist movies with TMDB data...")
+                enrich_entries(watchlist, tmdb_client, logger)
+
+                output_file = exporter.export_watchlist(watchlist)
+                logger.info(f"Watchlist exported to: {output_file}")
+            else:
+                logger.info("No watchlist items found")
+
+        tmdb_client.save_cache(Config.ENRICHMENT_CACHE_FILE)
 
     logger.info("")
     logger.info("=" * 50)
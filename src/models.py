@@ -5,7 +5,7 @@ from datetime import date
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Movie:
     """Represents a movie with its metadata."""
 
@@ -14,6 +14,22 @@ class Movie:
     tmdb_id: Optional[int] = None
     imdb_id: Optional[str] = None
     directors: list[str] = field(default_factory=list)
+    poster_path: Optional[str] = None  # TMDB image path, filled in by enrichment
+    _title_lower: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Titles are never reassigned, so hashing and equality can share this
+        self._title_lower = self.title.lower()
+
+    @property
+    def has_id(self) -> bool:
+        """Whether the movie can be matched on Letterboxd by TMDB or IMDB ID."""
+        return bool(self.tmdb_id or self.imdb_id)
+
+    @property
+    def directors_str(self) -> Optional[str]:
+        """Directors as one comma-separated string, None when unknown."""
+        return ", ".join(self.directors) or None
 
     def __hash__(self) -> int:
         """Hash based on TMDB ID, IMDB ID, or title+year."""
@@ -21,7 +37,7 @@ class Movie:
             return hash(("tmdb", self.tmdb_id))
         if self.imdb_id:
             return hash(("imdb", self.imdb_id))
-        return hash((self.title.lower(), self.year))
+        return hash((self._title_lower, self.year))
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Movie):
@@ -30,10 +46,10 @@ class Movie:
             return self.tmdb_id == other.tmdb_id
         if self.imdb_id and other.imdb_id:
             return self.imdb_id == other.imdb_id
-        return self.title.lower() == other.title.lower() and self.year == other.year
+        return self._title_lower == other._title_lower and self.year == other.year
 
 
-@dataclass
+@dataclass(slots=True)
 class WatchEntry:
     """Represents a watched movie entry."""
 
@@ -52,7 +68,7 @@ class WatchEntry:
         return round(rating_5 * 2) / 2  # Round to nearest 0.5
 
 
-@dataclass
+@dataclass(slots=True)
 class WatchlistEntry:
     """Represents a watchlist entry."""
 
@@ -1,7 +1,7 @@
 """Abstract base class for data sources."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional
 
 from src.models import WatchEntry, WatchlistEntry
 
@@ -25,6 +25,15 @@ class BaseSource(ABC):
         """
         pass
 
+    def iter_watched(self) -> Iterator[WatchEntry]:
+        """
+        Iterate over watched movies.
+
+        Sources that parse entries incrementally override this to yield them
+        without building the whole list first.
+        """
+        yield from self.get_watched()
+
     @abstractmethod
     def get_watchlist(self) -> List[WatchlistEntry]:
         """
@@ -35,6 +44,16 @@ class BaseSource(ABC):
         """
         pass
 
+    def get_last_activity(self) -> Optional[str]:
+        """
+        Get a marker that changes whenever the user's movie lists change.
+
+        Returns:
+            An opaque timestamp string, or None if the source has none, in
+            which case every sync fetches everything.
+        """
+        return None
+
     def test_connection(self) -> bool:
         """
         Test if the source is accessible.
@@ -43,3 +62,7 @@ class BaseSource(ABC):
             True if connection is successful, False otherwise.
         """
         return True
+
+    def close(self) -> None:
+        """Release any connections held by the source."""
+        pass
@@ -10,6 +10,10 @@ from src.sources.base import BaseSource
 
 logger = logging.getLogger(__name__)
 
+# Legacy agent guids, e.g. "com.plexapp.agents.themoviedb://603?lang=en"
+_TMDB_GUID_RE = re.compile(r"themoviedb://(\d+)")
+_IMDB_GUID_RE = re.compile(r"imdb://(tt\d+)")
+
 
 class PlexSource(BaseSource):
     """Plex API client using python-plexapi."""
@@ -60,13 +64,11 @@ class PlexSource(BaseSource):
             if section.type != "movie":
                 continue
 
-            logger.debug(f"Scanning library: {section.title}")
-
-            # Get all watched movies in this library
-            for item in section.search(unwatched=False):
-                if not item.isWatched:
-                    continue
+            logger.debug("Scanning library: %s", section.title)
 
+            # Let the server filter to watched movies, and return guids inline
+            # so reading item.guids doesn't trigger a reload per movie
+            for item in section.search(unwatched=False, includeGuids=True):
                 movie = self._parse_movie(item)
                 if not movie:
                     continue
@@ -111,21 +113,21 @@ class PlexSource(BaseSource):
                 guid_str = str(guid.id)
                 if guid_str.startswith("tmdb://"):
                     try:
-                        tmdb_id = int(guid_str.replace("tmdb://", ""))
+                        tmdb_id = int(guid_str.removeprefix("tmdb://"))
                     except ValueError:
                         pass
                 elif guid_str.startswith("imdb://"):
-                    imdb_id = guid_str.replace("imdb://", "")
+                    imdb_id = guid_str.removeprefix("imdb://")
 
             # Also check the main guid for older Plex versions
             if hasattr(item, "guid"):
                 main_guid = str(item.guid)
                 if "themoviedb://" in main_guid:
-                    match = re.search(r"themoviedb://(\d+)", main_guid)
+                    match = _TMDB_GUID_RE.search(main_guid)
                     if match:
                         tmdb_id = int(match.group(1))
                 elif "imdb://" in main_guid:
-                    match = re.search(r"imdb://(tt\d+)", main_guid)
+                    match = _IMDB_GUID_RE.search(main_guid)
                     if match:
                         imdb_id = match.group(1)
 
@@ -143,5 +145,5 @@ class PlexSource(BaseSource):
             )
 
         except Exception as e:
-            logger.warning(f"Failed to parse Plex movie: {e}")
+            logger.warning("Failed to parse Plex movie: %s", e)
             return None
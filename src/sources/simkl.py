@@ -1,11 +1,13 @@
 """Simkl API client for retrieving watch history."""
 
 import logging
-from datetime import date, datetime
+from datetime import date
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.auth.simkl_oauth import SimklOAuth
 from src.models import Movie, WatchEntry, WatchlistEntry
@@ -14,6 +16,22 @@ from src.sources.base import BaseSource
 logger = logging.getLogger(__name__)
 
 
+def _parse_date(timestamp: Optional[str]) -> Optional[date]:
+    """
+    Get the date part of a Simkl timestamp such as 2024-01-31T20:15:00Z.
+
+    The calendar date is the first ten characters, which is what
+    datetime.fromisoformat(...).date() would return without building
+    the datetime.
+    """
+    if timestamp:
+        try:
+            return date.fromisoformat(timestamp[:10])
+        except ValueError:
+            pass
+    return None
+
+
 class SimklSource(BaseSource):
     """Simkl API client."""
 
@@ -22,7 +40,13 @@ class SimklSource(BaseSource):
     def __init__(self, client_id: str, client_secret: str, token_file: Path, port: int = 19877):
         self.client_id = client_id
         self.oauth = SimklOAuth(client_id, client_secret, token_file, port=port)
+        # Headers shared by every call are set once; Authorization follows auth
         self.session = requests.Session()
+        self.session.headers.update({
+            "simkl-api-key": client_id,
+            "Content-Type": "application/json",
+        })
+        self.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
         self._access_token: Optional[str] = None
 
     @property
@@ -37,6 +61,7 @@ class SimklSource(BaseSource):
         token = self.oauth.authenticate()
         if token:
             self._access_token = token
+            self.session.headers["Authorization"] = f"Bearer {token}"
             return True
 
         logger.error("Failed to authenticate with Simkl")
@@ -44,24 +69,37 @@ class SimklSource(BaseSource):
 
     def _get(self, endpoint: str, params: Optional[dict] = None) -> Optional[dict | list]:
         """Make authenticated GET request to Simkl API."""
+        return self._request("GET", endpoint, params)
+
+    def _request(
+        self, method: str, endpoint: str, params: Optional[dict] = None
+    ) -> Optional[dict | list]:
+        """Make authenticated request to Simkl API."""
         if not self._ensure_authenticated():
             return None
 
         url = f"{self.BASE_URL}{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self._access_token}",
-            "simkl-api-key": self.client_id,
-            "Content-Type": "application/json",
-        }
 
         try:
-            response = self.session.get(url, headers=headers, params=params, timeout=30)
+            response = self.session.request(method, url, params=params, timeout=30)
             response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Simkl API error for {endpoint}: {e}")
             return None
 
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
+
+    def get_last_activity(self) -> Optional[str]:
+        """Get when the user's movie lists last changed on Simkl."""
+        data = self._request("POST", "/sync/activities")
+        movies = data.get("movies") if isinstance(data, dict) else None
+        if isinstance(movies, dict):
+            return movies.get("all")
+        return None
+
     def test_connection(self) -> bool:
         """Test Simkl API connection."""
         if not self._ensure_authenticated():
@@ -72,14 +110,19 @@ class SimklSource(BaseSource):
 
     def get_watched(self) -> List[WatchEntry]:
         """Get watched movies from Simkl."""
+        entries = list(self.iter_watched())
+        logger.info(f"Found {len(entries)} watched movies on Simkl")
+        return entries
+
+    def iter_watched(self) -> Iterator[WatchEntry]:
+        """Yield watched movies from Simkl as they are parsed."""
         logger.info("Fetching watched movies from Simkl...")
 
         # Get all movies with their status
         data = self._get("/sync/all-items/movies")
         if not data:
-            return []
+            return
 
-        entries = []
         movies_data = data.get("movies", [])
 
         for item in movies_data:
@@ -99,14 +142,7 @@ class SimklSource(BaseSource):
             )
 
             # Parse watched date
-            watched_date = None
-            last_watched = item.get("last_watched_at") or item.get("watched_at")
-            if last_watched:
-                try:
-                    dt = datetime.fromisoformat(last_watched.replace("Z", "+00:00"))
-                    watched_date = dt.date()
-                except ValueError:
-                    pass
+            watched_date = _parse_date(item.get("last_watched_at") or item.get("watched_at"))
 
             # Parse rating (Simkl uses 1-10 scale)
             rating = None
@@ -114,16 +150,12 @@ class SimklSource(BaseSource):
             if user_rating:
                 rating = WatchEntry.convert_rating_10_to_5(float(user_rating))
 
-            entry = WatchEntry(
+            yield WatchEntry(
                 movie=movie,
                 watched_date=watched_date,
                 rating=rating,
                 rewatch=False,  # Simkl doesn't track rewatches explicitly
             )
-            entries.append(entry)
-
-        logger.info(f"Found {len(entries)} watched movies on Simkl")
-        return entries
 
     def get_watchlist(self) -> List[WatchlistEntry]:
         """Get watchlist from Simkl."""
@@ -153,14 +185,7 @@ class SimklSource(BaseSource):
             )
 
             # Parse added date
-            added_date = None
-            added_at = item.get("added_at")
-            if added_at:
-                try:
-                    dt = datetime.fromisoformat(added_at.replace("Z", "+00:00"))
-                    added_date = dt.date()
-                except ValueError:
-                    pass
+            added_date = _parse_date(item.get("added_at"))
 
             entry = WatchlistEntry(
                 movie=movie,
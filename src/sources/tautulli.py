@@ -1,10 +1,12 @@
 """Tautulli API client for retrieving watch history."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
 from typing import List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.models import Movie, WatchEntry, WatchlistEntry
 from src.sources.base import BaseSource
@@ -15,11 +17,17 @@ logger = logging.getLogger(__name__)
 class TautulliSource(BaseSource):
     """Tautulli API client."""
 
+    HISTORY_PAGE_SIZE = 100  # Items per get_history page
+    HISTORY_WORKERS = 4  # Pages fetched concurrently once the total is known
+
     def __init__(self, base_url: str, api_key: str, user_id: int = 1):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.user_id = user_id
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.HISTORY_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     @property
     def name(self) -> str:
@@ -50,6 +58,10 @@ class TautulliSource(BaseSource):
             logger.error(f"Tautulli API error: {e}")
             return None
 
+    def close(self) -> None:
+        """Close the HTTP session."""
+        self.session.close()
+
     def test_connection(self) -> bool:
         """Test Tautulli API connection."""
         data = self._get("get_server_info")
@@ -58,28 +70,46 @@ class TautulliSource(BaseSource):
             return True
         return False
 
-    def get_watched(self) -> List[WatchEntry]:
-        """Get watched movies from Tautulli history."""
-        logger.info("Fetching watched movies from Tautulli...")
+    def _get_history_page(self, start: int) -> Optional[dict]:
+        """Fetch one page of movie history starting at the given offset."""
+        return self._get("get_history", {
+            "user_id": self.user_id,
+            "media_type": "movie",
+            "start": start,
+            "length": self.HISTORY_PAGE_SIZE,
+        })
 
-        entries = []
-        seen_movies = set()  # Track unique movies
+    def _get_history_pages(self) -> List[dict]:
+        """
+        Fetch every page of movie history, in order.
 
-        # Get history with pagination
-        start = 0
-        length = 100  # Items per page
+        The first page reports the total, after which the remaining pages
+        are independent and fetched concurrently. Pages after a failed
+        one are dropped, as a sequential walk would have stopped there.
+        """
+        first = self._get_history_page(0)
+        if not first:
+            return []
+
+        pages = [first]
+        total_count = first.get("recordsFiltered", 0)
+        starts = range(self.HISTORY_PAGE_SIZE, total_count, self.HISTORY_PAGE_SIZE)
+        if first.get("data") and starts:
+            with ThreadPoolExecutor(max_workers=self.HISTORY_WORKERS) as executor:
+                for data in executor.map(self._get_history_page, starts):
+                    if not data:
+                        break
+                    pages.append(data)
+        return pages
 
-        while True:
-            data = self._get("get_history", {
-                "user_id": self.user_id,
-                "media_type": "movie",
-                "start": start,
-                "length": length,
-            })
+    def get_watched(self) -> List[WatchEntry]:
+        """Get watched movies from Tautulli history."""
+        logger.info("Fetching watched movies from Tautulli...")
 
-            if not data:
-                break
+        # Most recent watch per movie, in first-seen order
+        latest: dict[tuple, WatchEntry] = {}
 
+        for data in self._get_history_pages():
             history_data = data.get("data", [])
             if not history_data:
                 break
@@ -91,18 +121,7 @@ class TautulliSource(BaseSource):
 
                 title = item.get("title", "Unknown")
                 year = item.get("year")
-
-                # Create unique key for deduplication
-                movie_key = (title.lower(), year)
-                is_rewatch = movie_key in seen_movies
-                seen_movies.add(movie_key)
-
-                # Tautulli doesn't provide TMDB/IMDB IDs directly
-                # These will need to be enriched via TMDB search
-                movie = Movie(
-                    title=title,
-                    year=int(year) if year else None,
-                )
+                year = int(year) if year else None
 
                 # Parse watched date
                 watched_date = None
@@ -113,24 +132,28 @@ class TautulliSource(BaseSource):
                     except (ValueError, TypeError):
                         pass
 
+                # Any further watch of a known movie makes it a rewatch; only
+                # a strictly newer one replaces the entry that is kept
+                movie_key = (title.lower(), year)
+                current = latest.get(movie_key)
+                if current is not None:
+                    current.rewatch = True
+                    if (watched_date or date.min) <= (current.watched_date or date.min):
+                        continue
+
+                # Tautulli doesn't provide TMDB/IMDB IDs directly
+                # These will need to be enriched via TMDB search
+                movie = Movie(title=title, year=year)
+
                 # Tautulli doesn't have user ratings
-                entry = WatchEntry(
+                latest[movie_key] = WatchEntry(
                     movie=movie,
                     watched_date=watched_date,
                     rating=None,
-                    rewatch=is_rewatch,
+                    rewatch=current is not None,
                 )
-                entries.append(entry)
-
-            # Check if we've reached the end
-            total_count = data.get("recordsFiltered", 0)
-            start += length
-            if start >= total_count:
-                break
 
-        # Keep only the most recent watch for each movie
-        # (unless tracking rewatches is desired)
-        unique_entries = self._deduplicate_entries(entries)
+        unique_entries = list(latest.values())
 
         logger.info(f"Found {len(unique_entries)} watched movies on Tautulli")
         return unique_entries
@@ -139,38 +162,3 @@ class TautulliSource(BaseSource):
         """Tautulli doesn't have watchlist support."""
         logger.info("Tautulli does not support watchlists, returning empty list")
         return []
-
-    def _deduplicate_entries(self, entries: List[WatchEntry]) -> List[WatchEntry]:
-        """
-        Deduplicate entries, keeping the most recent watch per movie.
-
-        Marks earlier watches as rewatches.
-        """
-        # Group by movie
-        movies: dict[tuple, List[WatchEntry]] = {}
-        for entry in entries:
-            key = (entry.movie.title.lower(), entry.movie.year)
-            if key not in movies:
-                movies[key] = []
-            movies[key].append(entry)
-
-        # For each movie, keep the most recent entry
-        result = []
-        for key, movie_entries in movies.items():
-            # Sort by date, most recent first
-            sorted_entries = sorted(
-                movie_entries,
-                key=lambda e: e.watched_date or date.min,
-                reverse=True,
-            )
-
-            # Take the most recent
-            latest = sorted_entries[0]
-
-            # Mark as rewatch if there were multiple watches
-            if len(sorted_entries) > 1:
-                latest.rewatch = True
-
-            result.append(latest)
-
-        return result
@@ -1,36 +1,108 @@
 """FastAPI web application."""
 
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Callable, Optional
 
-from fastapi import FastAPI, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
 from src.config import Config
-from src.web.database import Database
+from src.web.database import Database, MovieDB
 from src.web.sync_service import SyncService
 
 logger = logging.getLogger(__name__)
 
-# Initialize database
-db = Database()
-sync_service: Optional[SyncService] = None
+# Manual sync started from the API; kept so only one runs at a time
+_sync_task: Optional[asyncio.Task] = None
+
+# Short-lived cache for read-only dashboard queries, cleared on every write
+API_CACHE_TTL = 30  # Seconds
+API_CACHE_SIZE = 256  # Entries; search and cursor values make keys unbounded
+_api_cache: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+# Changes whenever the cache is cleared; the start time keeps ETags from an
+# earlier process from matching after a restart
+_data_version = [time.time_ns(), 0]
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Faster than the stdlib encoder, and dates and datetimes serialize to
+    ISO 8601 directly, so the row dicts can carry them as-is.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def _cached(key: tuple, compute: Callable[[], object]) -> object:
+    """Return a fresh cached result for key, computing and storing it if needed."""
+    now = time.monotonic()
+    cached = _api_cache.get(key)
+    if cached and cached[0] > now:
+        _api_cache.move_to_end(key)
+        return cached[1]
+    value = compute()
+    _api_cache[key] = (time.monotonic() + API_CACHE_TTL, value)
+    _api_cache.move_to_end(key)
+    # Drop expired entries, then the least recently used ones beyond the limit
+    for stale_key, (expires, _) in list(_api_cache.items()):
+        if expires <= now:
+            del _api_cache[stale_key]
+    while len(_api_cache) > API_CACHE_SIZE:
+        _api_cache.popitem(last=False)
+    return value
+
+
+def _invalidate_cache(*_) -> None:
+    """Drop cached query results after the movies table changed."""
+    _data_version[1] += 1
+    _api_cache.clear()
+
+
+def _conditional(request: Request, key: tuple, compute: Callable[[], object]) -> Response:
+    """
+    Serve a cached query result with an ETag, or 304 if the client has it.
+
+    no-cache makes browsers revalidate every time, so edits show up at
+    once while unchanged data costs only an empty 304.
+    """
+    version = f"{_data_version[0]}:{_data_version[1]}:{key!r}"
+    etag = '"' + hashlib.md5(version.encode()).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(_cached(key, compute), headers=headers)
+
+
+async def get_db(request: Request) -> AsyncIterator[Session]:
+    """Share one database session between all queries of a request."""
+    with request.app.state.db.get_session() as session:
+        yield session
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
-    global sync_service
-
     # Startup
     logger.info("Starting web application...")
-    sync_service = SyncService(db)
+    app.state.db = Database()
+    app.state.sync_service = sync_service = SyncService(
+        app.state.db, on_sync_complete=_invalidate_cache
+    )
 
     # Start background sync (every 15 minutes)
     sync_interval = int(Config.SYNC_INTERVAL) if hasattr(Config, 'SYNC_INTERVAL') else 15
@@ -39,19 +111,21 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
-    if sync_service:
-        sync_service.stop()
+    sync_service.stop()
+    app.state.db.close()
 
 
 app = FastAPI(
     title="Letterboxd Sync",
     description="Manage your movie watch history",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Mount static files
 static_path = Path(__file__).parent / "static"
-static_path.mkdir(exist_ok=True)
+if not static_path.exists():
+    static_path.mkdir()
 app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 
 # Templates
@@ -77,47 +151,60 @@ class SyncResponse(BaseModel):
 
 # ============== HTML Pages ==============
 
+def _render_page(request: Request, name: str, context: Callable[[], dict]) -> HTMLResponse:
+    """
+    Render a page template through the query cache.
+
+    The templates only depend on collection data and the request path
+    (for the active nav link), so the rendered HTML is shared between
+    visitors of the same path and dropped along with the query results.
+    Anything that changes on its own, like the sync status, must stay out
+    of the context; the pages fetch it from the API instead.
+    """
+    def render() -> str:
+        return templates.get_template(name).render({"request": request, **context()})
+
+    return HTMLResponse(_cached(("page", name, request.url.path), render))
+
+
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request):
+async def index(request: Request, session: Session = Depends(get_db)):
     """Main dashboard page."""
-    stats = db.get_statistics()
-    sync_status = db.get_sync_status()
-    years = db.get_years()
-
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "stats": stats,
-            "sync_status": sync_status,
-            "years": years,
-        },
-    )
+    db = request.app.state.db
+    return _render_page(request, "index.html", lambda: {
+        "stats": _cached(("stats",), lambda: db.get_statistics(session)),
+        "years": _cached(("years",), lambda: db.get_years(session)),
+    })
+
+
+_watchlist_html: Optional[str] = None
 
 
 @app.get("/watchlist", response_class=HTMLResponse)
 async def watchlist_page(request: Request):
     """Watchlist page."""
-    return templates.TemplateResponse(
-        "watchlist.html",
-        {"request": request},
-    )
+    global _watchlist_html
+
+    # No server-side data at all; the list is fetched by the page itself
+    if _watchlist_html is None:
+        _watchlist_html = templates.get_template("watchlist.html").render({"request": request})
+    return HTMLResponse(_watchlist_html)
 
 
 @app.get("/stats", response_class=HTMLResponse)
-async def stats_page(request: Request):
+async def stats_page(request: Request, session: Session = Depends(get_db)):
     """Statistics page."""
-    stats = db.get_statistics()
-    return templates.TemplateResponse(
-        "stats.html",
-        {"request": request, "stats": stats},
-    )
+    db = request.app.state.db
+    return _render_page(request, "stats.html", lambda: {
+        "stats": _cached(("stats",), lambda: db.get_statistics(session)),
+    })
 
 
 # ============== API Endpoints ==============
 
 @app.get("/api/movies")
 async def get_movies(
+    request: Request,
     watched: Optional[bool] = Query(True),
     watchlist: Optional[bool] = Query(None),
     search: Optional[str] = Query(None),
@@ -128,42 +215,71 @@ async def get_movies(
     sort_order: str = Query("desc"),
     limit: int = Query(50),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None),
+    session: Session = Depends(get_db),
 ):
-    """Get movies with filters."""
-    movies = db.get_all_movies(
-        watched=watched,
-        watchlist=watchlist,
-        search=search,
-        year=year,
-        min_rating=min_rating,
-        max_rating=max_rating,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        limit=limit,
-        offset=offset,
+    """
+    Get movies with filters.
+
+    Follow next_cursor for further pages; total is only counted for the
+    first page. offset is still accepted for older clients. Listings leave
+    out review and bookkeeping fields; GET /api/movies/{id} has them all.
+    """
+    db = request.app.state.db
+
+    def query() -> dict:
+        movies = db.get_movie_summaries(
+            watched=watched,
+            watchlist=watchlist,
+            search=search,
+            year=year,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            session=session,
+        )
+
+        total = None
+        if not cursor:
+            total = db.count_movies(
+                watched=watched, watchlist=watchlist, search=search, session=session
+            )
+
+        return {
+            "movies": [MovieDB.summary_dict(m) for m in movies],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": (
+                db.encode_cursor(movies[-1], sort_by) if movies and len(movies) == limit else None
+            ),
+        }
+
+    key = (
+        "movies", watched, watchlist, search, year, min_rating, max_rating,
+        sort_by, sort_order, limit, offset, cursor,
     )
-
-    total = db.count_movies(watched=watched, watchlist=watchlist, search=search)
-
-    return {
-        "movies": [m.to_dict() for m in movies],
-        "total": total,
-        "limit": limit,
-        "offset": offset,
-    }
+    try:
+        return _conditional(request, key, query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/movies/{movie_id}")
-async def get_movie(movie_id: int):
+async def get_movie(request: Request, movie_id: int, session: Session = Depends(get_db)):
     """Get a single movie."""
-    movie = db.get_movie_by_id(movie_id)
+    movie = request.app.state.db.get_movie_by_id(movie_id, session)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
-    return movie.to_dict()
+    return ORJSONResponse(movie.to_dict())
 
 
 @app.patch("/api/movies/{movie_id}")
-async def update_movie(movie_id: int, updates: MovieUpdate):
+async def update_movie(request: Request, movie_id: int, updates: MovieUpdate):
     """Update a movie."""
     update_data = updates.model_dump(exclude_unset=True)
 
@@ -174,39 +290,44 @@ async def update_movie(movie_id: int, updates: MovieUpdate):
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format")
 
-    movie = db.update_movie(movie_id, update_data)
+    movie = request.app.state.db.update_movie(movie_id, update_data)
     if not movie:
         raise HTTPException(status_code=404, detail="Movie not found")
+    _invalidate_cache()
 
-    return movie.to_dict()
+    return ORJSONResponse(movie.to_dict())
 
 
 @app.delete("/api/movies/{movie_id}")
-async def delete_movie(movie_id: int):
+async def delete_movie(request: Request, movie_id: int):
     """Delete a movie."""
-    if db.delete_movie(movie_id):
+    if request.app.state.db.delete_movie(movie_id):
+        _invalidate_cache()
         return {"status": "deleted"}
     raise HTTPException(status_code=404, detail="Movie not found")
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(request: Request, session: Session = Depends(get_db)):
     """Get statistics."""
-    return db.get_statistics()
+    db = request.app.state.db
+    return _conditional(request, ("stats",), lambda: db.get_statistics(session))
 
 
 @app.get("/api/years")
-async def get_years():
+async def get_years(request: Request, session: Session = Depends(get_db)):
     """Get list of years."""
-    return db.get_years()
+    db = request.app.state.db
+    return _conditional(request, ("years",), lambda: db.get_years(session))
 
 
 @app.get("/api/sync/status")
-async def get_sync_status():
+async def get_sync_status(request: Request, session: Session = Depends(get_db)):
     """Get sync status."""
-    status = db.get_sync_status()
+    sync_service = getattr(request.app.state, "sync_service", None)
+    status = request.app.state.db.get_sync_status(session)
     return {
-        "last_sync": status.last_sync.isoformat() if status.last_sync else None,
+        "last_sync": status.last_sync,
         "movies_count": status.movies_count,
         "watchlist_count": status.watchlist_count,
         "status": status.status,
@@ -216,18 +337,19 @@ async def get_sync_status():
 
 
 @app.post("/api/sync/trigger")
-async def trigger_sync():
+async def trigger_sync(request: Request):
     """Manually trigger a sync."""
+    global _sync_task
+
+    sync_service = getattr(request.app.state, "sync_service", None)
     if not sync_service:
         raise HTTPException(status_code=503, detail="Sync service not available")
 
-    if sync_service.is_syncing:
+    if sync_service.is_syncing or (_sync_task and not _sync_task.done()):
         return {"status": "already_syncing", "message": "Sync already in progress"}
 
-    # Run sync in background thread (non-blocking)
-    import threading
-    thread = threading.Thread(target=sync_service.sync)
-    thread.start()
+    # Run the blocking sync on a worker thread without holding up the response
+    _sync_task = asyncio.create_task(asyncio.to_thread(sync_service.sync))
 
     return {"status": "started", "message": "Sync started"}
 
@@ -297,56 +419,62 @@ async def auth_start():
 
 # ============== Export ==============
 
+class _Echo:
+    """File-like object whose write() hands the csv line back to the caller."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
 @app.get("/api/export/csv")
 async def export_csv(
+    request: Request,
     watched: bool = Query(True),
     watchlist: bool = Query(False),
 ):
-    """Export movies to CSV format."""
-    from io import StringIO
+    """Export movies to CSV format, streamed row by row."""
     import csv
+    from fastapi.responses import StreamingResponse
 
-    output = StringIO()
-    writer = csv.writer(output)
-
-    if watched:
-        # Watched movies
-        writer.writerow([
-            "imdbID", "tmdbID", "Title", "Year", "Directors",
-            "WatchedDate", "Rating", "Rewatch", "Tags", "Review"
-        ])
-
-        movies = db.get_all_movies(watched=True, limit=10000)
-        for m in movies:
-            writer.writerow([
-                m.imdb_id or "",
-                m.tmdb_id or "",
-                m.title,
-                m.year or "",
-                m.directors or "",
-                m.watched_date.isoformat() if m.watched_date else "",
-                m.rating or "",
-                "true" if m.rewatch else "false",
-                m.tags or "",
-                m.review or "",
-            ])
-    elif watchlist:
-        # Watchlist
-        writer.writerow(["imdbID", "tmdbID", "Title", "Year", "Directors"])
-
-        movies = db.get_all_movies(watchlist=True, limit=10000)
-        for m in movies:
-            writer.writerow([
-                m.imdb_id or "",
-                m.tmdb_id or "",
-                m.title,
-                m.year or "",
-                m.directors or "",
+    db = request.app.state.db
+    writer = csv.writer(_Echo())
+
+    def rows():
+        if watched:
+            # Watched movies
+            yield writer.writerow([
+                "imdbID", "tmdbID", "Title", "Year", "Directors",
+                "WatchedDate", "Rating", "Rewatch", "Tags", "Review"
             ])
 
-    from fastapi.responses import Response
-    return Response(
-        content=output.getvalue(),
+            for m in db.iter_movies(watched=True):
+                yield writer.writerow([
+                    m.imdb_id or "",
+                    m.tmdb_id or "",
+                    m.title,
+                    m.year or "",
+                    m.directors or "",
+                    m.watched_date.isoformat() if m.watched_date else "",
+                    m.rating or "",
+                    "true" if m.rewatch else "false",
+                    m.tags or "",
+                    m.review or "",
+                ])
+        elif watchlist:
+            # Watchlist
+            yield writer.writerow(["imdbID", "tmdbID", "Title", "Year", "Directors"])
+
+            for m in db.iter_movies(watchlist=True):
+                yield writer.writerow([
+                    m.imdb_id or "",
+                    m.tmdb_id or "",
+                    m.title,
+                    m.year or "",
+                    m.directors or "",
+                ])
+
+    return StreamingResponse(
+        rows(),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename=letterboxd_{'watched' if watched else 'watchlist'}.csv"
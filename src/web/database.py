@@ -1,24 +1,58 @@
 """Database models and operations using SQLAlchemy."""
 
+import base64
+from contextlib import contextmanager
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
+import orjson
 from sqlalchemy import (
     Boolean,
     Column,
     Date,
     DateTime,
     Float,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    event,
+    and_,
     func,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
 )
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 
+# Letterboxd's half-star rating scale
+RATING_STEPS = [0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]
+
+# TMDB IDs per IN (...) lookup; older SQLite builds allow 999 parameters
+CHANGE_CHECK_CHUNK = 900
+
+
+def _link_urls(tmdb_id: Optional[int], imdb_id: Optional[str]) -> tuple:
+    """Letterboxd, TMDB and IMDB URLs for a movie, None where the ID is missing."""
+    letterboxd_url = tmdb_url = imdb_url = None
+    if tmdb_id:
+        tmdb_str = str(tmdb_id)
+        letterboxd_url = "https://letterboxd.com/tmdb/" + tmdb_str + "/"
+        tmdb_url = "https://www.themoviedb.org/movie/" + tmdb_str
+    if imdb_id:
+        imdb_url = "https://www.imdb.com/title/" + imdb_id + "/"
+    return letterboxd_url, tmdb_url, imdb_url
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -27,6 +61,16 @@ class MovieDB(Base):
     """SQLAlchemy model for movies."""
 
     __tablename__ = "movies"
+    # Read SQL-generated timestamps back with RETURNING; objects outlive sessions
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Filter + sort paths used by the movie list and statistics
+        Index("ix_movies_watched_date", "is_watched", "watched_date"),
+        Index("ix_movies_watchlist_title", "is_watchlist", "title"),
+        Index("ix_movies_watched_rating", "is_watched", "rating"),
+        # Covers the DISTINCT year list behind the year filter
+        Index("ix_movies_year", "year"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     tmdb_id = Column(Integer, unique=True, nullable=True, index=True)
@@ -48,54 +92,90 @@ class MovieDB(Base):
     is_watchlist = Column(Boolean, default=False)
 
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Rendered into the INSERT/UPDATE as SQL, so bulk writes make no per-row calls
+    created_at = Column(DateTime, default=func.current_timestamp())
+    updated_at = Column(
+        DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp()
+    )
     source = Column(String(50), default="simkl")
 
     @property
     def letterboxd_url(self) -> Optional[str]:
         """Generate Letterboxd URL."""
-        if self.tmdb_id:
-            return f"https://letterboxd.com/tmdb/{self.tmdb_id}/"
-        return None
+        return _link_urls(self.tmdb_id, None)[0]
 
     @property
     def tmdb_url(self) -> Optional[str]:
         """Generate TMDB URL."""
-        if self.tmdb_id:
-            return f"https://www.themoviedb.org/movie/{self.tmdb_id}"
-        return None
+        return _link_urls(self.tmdb_id, None)[1]
 
     @property
     def imdb_url(self) -> Optional[str]:
         """Generate IMDB URL."""
-        if self.imdb_id:
-            return f"https://www.imdb.com/title/{self.imdb_id}/"
-        return None
+        return _link_urls(None, self.imdb_id)[2]
+
+    # Fields the movie list pages use; detail-only text stays out of listings
+    LIST_COLUMNS = (
+        "id", "tmdb_id", "imdb_id", "title", "year", "directors", "poster_url",
+        "watched_date", "rating", "rewatch", "tags", "is_watched", "is_watchlist",
+    )
+
+    @staticmethod
+    def summary_dict(row) -> dict:
+        """Convert a LIST_COLUMNS row to the listing's JSON shape."""
+        tmdb_id = row.tmdb_id
+        imdb_id = row.imdb_id
+        watched_date = row.watched_date
+        letterboxd_url, tmdb_url, imdb_url = _link_urls(tmdb_id, imdb_id)
+        return {
+            "id": row.id,
+            "tmdb_id": tmdb_id,
+            "imdb_id": imdb_id,
+            "title": row.title,
+            "year": row.year,
+            "directors": row.directors,
+            "poster_url": row.poster_url,
+            "watched_date": watched_date,
+            "rating": row.rating,
+            "rewatch": row.rewatch,
+            "tags": row.tags,
+            "is_watched": row.is_watched,
+            "is_watchlist": row.is_watchlist,
+            "letterboxd_url": letterboxd_url,
+            "tmdb_url": tmdb_url,
+            "imdb_url": imdb_url,
+        }
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
+        # Read each attribute once; the URL properties would re-read the IDs
+        tmdb_id = self.tmdb_id
+        imdb_id = self.imdb_id
+        watched_date = self.watched_date
+        created_at = self.created_at
+        updated_at = self.updated_at
+        letterboxd_url, tmdb_url, imdb_url = _link_urls(tmdb_id, imdb_id)
         return {
             "id": self.id,
-            "tmdb_id": self.tmdb_id,
-            "imdb_id": self.imdb_id,
+            "tmdb_id": tmdb_id,
+            "imdb_id": imdb_id,
             "title": self.title,
             "year": self.year,
             "directors": self.directors,
             "poster_url": self.poster_url,
-            "watched_date": self.watched_date.isoformat() if self.watched_date else None,
+            "watched_date": watched_date,
             "rating": self.rating,
             "rewatch": self.rewatch,
             "tags": self.tags,
             "review": self.review,
             "is_watched": self.is_watched,
             "is_watchlist": self.is_watchlist,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": created_at,
+            "updated_at": updated_at,
             "source": self.source,
-            "letterboxd_url": self.letterboxd_url,
-            "tmdb_url": self.tmdb_url,
-            "imdb_url": self.imdb_url,
+            "letterboxd_url": letterboxd_url,
+            "tmdb_url": tmdb_url,
+            "imdb_url": imdb_url,
         }
 
 
@@ -110,20 +190,154 @@ class SyncStatus(Base):
     watchlist_count = Column(Integer, default=0)
     status = Column(String(50), default="idle")  # idle, syncing, error
     error_message = Column(Text, nullable=True)
+    last_activity = Column(String(50), nullable=True)  # Source marker seen by the last sync
+
+
+@lru_cache(maxsize=None)
+def _upsert_statement(columns: tuple):
+    """
+    Build the bulk UPSERT for rows with the given keys.
+
+    Syncs only ever send a couple of key sets, so each statement is built
+    once and SQLAlchemy's compiled cache and sqlite3's statement cache do
+    the rest on every later executemany.
+    """
+    table = MovieDB.__table__
+    stmt = insert(MovieDB)
+    set_ = {
+        key: func.coalesce(stmt.excluded[key], table.c[key])
+        for key in columns
+        if key != "tmdb_id"
+    }
+    set_["updated_at"] = func.current_timestamp()
+    return stmt.on_conflict_do_update(index_elements=["tmdb_id"], set_=set_)
 
 
 class Database:
     """Database operations."""
 
     def __init__(self, db_path: Path = Path("data/movies.db")):
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.engine = create_engine(f"sqlite:///{db_path}", echo=False)
+        if not db_path.parent.exists():
+            db_path.parent.mkdir(parents=True)
+        self.engine = create_engine(
+            f"sqlite:///{db_path}",
+            echo=False,
+            connect_args={"check_same_thread": False},
+            pool_pre_ping=True,
+        )
+        event.listen(self.engine, "connect", self._configure_connection)
         Base.metadata.create_all(self.engine)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        # create_all skips tables that already exist, so add newer columns
+        # and indexes here
+        self._add_missing_columns()
+        for index in MovieDB.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        self._has_fts = self._create_title_index()
+        # Objects are returned after their session closes, so keep them loaded
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def _add_missing_columns(self) -> None:
+        """Add model columns that a database created by an older version lacks."""
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        column_type = column.type.compile(self.engine.dialect)
+                        conn.execute(text(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                        ))
+
+    def _create_title_index(self) -> bool:
+        """
+        Create the FTS5 trigram index used for title search, if missing.
+
+        Triggers keep it in step with the movies table. Returns False when
+        this SQLite build has no FTS5 trigram tokenizer (before 3.34), in
+        which case searches fall back to LIKE.
+        """
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name='movies_fts'")
+                ).first()
+                if not exists:
+                    conn.execute(text(
+                        "CREATE VIRTUAL TABLE movies_fts USING fts5("
+                        "title, content='movies', content_rowid='id', tokenize='trigram')"
+                    ))
+                    # Index the rows that predate the table
+                    conn.execute(text("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')"))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN "
+                    "INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN "
+                    "INSERT INTO movies_fts(movies_fts, rowid, title) "
+                    "VALUES ('delete', old.id, old.title); END"
+                ))
+                conn.execute(text(
+                    "CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title ON movies BEGIN "
+                    "INSERT INTO movies_fts(movies_fts, rowid, title) "
+                    "VALUES ('delete', old.id, old.title); "
+                    "INSERT INTO movies_fts(rowid, title) VALUES (new.id, new.title); END"
+                ))
+            return True
+        except OperationalError:
+            return False
+
+    def _title_matches(self, search: str):
+        """Condition matching titles that contain search, case-insensitively."""
+        # Trigrams need at least three characters to match anything
+        if not self._has_fts or len(search) < 3:
+            return MovieDB.title.ilike(f"%{search}%")
+        phrase = '"' + search.replace('"', '""') + '"'
+        matches = (
+            select(literal_column("rowid"))
+            .select_from(table("movies_fts"))
+            .where(literal_column("movies_fts").op("MATCH")(phrase))
+        )
+        return MovieDB.id.in_(matches)
+
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record) -> None:
+        """
+        Tune each new SQLite connection.
+
+        WAL lets the web handlers read while a sync is writing, and
+        synchronous=NORMAL is durable enough in WAL mode.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.engine.dispose()
 
     def get_session(self) -> Session:
         return self.SessionLocal()
 
+    @contextmanager
+    def _use_session(self, session: Optional[Session]) -> Iterator[Session]:
+        """
+        Yield the caller's session, or a new one closed afterwards.
+
+        Read helpers take an optional session so one request can run all its
+        queries on a single session instead of checking out one per call.
+        """
+        if session is not None:
+            yield session
+            return
+        with self.get_session() as session:
+            yield session
+
     def get_all_movies(
         self,
         watched: Optional[bool] = None,
@@ -136,110 +350,310 @@ class Database:
         sort_order: str = "desc",
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        session: Optional[Session] = None,
     ) -> list[MovieDB]:
-        """Get movies with filters."""
-        with self.get_session() as session:
-            query = session.query(MovieDB)
+        """
+        Get movies with filters.
+
+        Pass the cursor from encode_cursor() for the last row of a page to
+        seek straight to the next page; offset is ignored in that case.
+        Raises ValueError for a malformed cursor.
+        """
+        query = self._list_query(
+            select(MovieDB), watched, watchlist, search, year, min_rating, max_rating,
+            sort_by, sort_order, limit, offset, cursor,
+        )
+        with self._use_session(session) as session:
+            return list(session.scalars(query))
+
+    def get_movie_summaries(
+        self,
+        watched: Optional[bool] = None,
+        watchlist: Optional[bool] = None,
+        search: Optional[str] = None,
+        year: Optional[int] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+        sort_by: str = "watched_date",
+        sort_order: str = "desc",
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        session: Optional[Session] = None,
+    ) -> list:
+        """
+        Like get_all_movies, but select only the LIST_COLUMNS as plain rows.
+
+        The rows carry the sort column too, so encode_cursor() accepts them.
+        """
+        sort_column = self._sort_column(sort_by)
+        columns = [getattr(MovieDB, name) for name in MovieDB.LIST_COLUMNS]
+        if sort_column.key not in MovieDB.LIST_COLUMNS:
+            columns.append(sort_column)
+        query = self._list_query(
+            select(*columns), watched, watchlist, search, year, min_rating, max_rating,
+            sort_by, sort_order, limit, offset, cursor,
+        )
+        with self._use_session(session) as session:
+            return session.execute(query).all()
+
+    def _list_query(
+        self, query, watched, watchlist, search, year, min_rating, max_rating,
+        sort_by, sort_order, limit, offset, cursor,
+    ):
+        """Apply the movie list filters, sorting and paging to a select."""
+        if watched is not None:
+            query = query.where(MovieDB.is_watched == watched)
+        if watchlist is not None:
+            query = query.where(MovieDB.is_watchlist == watchlist)
+        if search:
+            query = query.where(self._title_matches(search))
+        if year:
+            query = query.where(MovieDB.year == year)
+        if min_rating is not None:
+            query = query.where(MovieDB.rating >= min_rating)
+        if max_rating is not None:
+            query = query.where(MovieDB.rating <= max_rating)
+
+        # Sorting, with id as tie-breaker so cursors are unambiguous
+        sort_column = self._sort_column(sort_by)
+        timestamp = isinstance(sort_column.type, DateTime)
+        if timestamp:
+            # SQLite keeps timestamps as text in more than one format; sort and
+            # seek on datetime()'s form so a cursor matches its own row again
+            sort_column = func.datetime(sort_column)
+        descending = sort_order == "desc"
+        if descending:
+            query = query.order_by(sort_column.desc().nullslast(), MovieDB.id.desc())
+        else:
+            query = query.order_by(sort_column.asc().nullsfirst(), MovieDB.id.asc())
+
+        if cursor:
+            value, movie_id = self._decode_cursor(cursor, self._sort_column(sort_by))
+            if timestamp and value is not None:
+                value = value.strftime("%Y-%m-%d %H:%M:%S")
+            query = query.where(self._after(sort_column, value, movie_id, descending))
+        elif offset:
+            query = query.offset(offset)
+
+        return query.limit(limit)
+
+    @staticmethod
+    def _sort_column(sort_by: str):
+        """Resolve a sort field name to a movies column, defaulting to watched_date."""
+        column = MovieDB.__table__.columns.get(sort_by)
+        return getattr(MovieDB, column.key) if column is not None else MovieDB.watched_date
+
+    def encode_cursor(self, movie: MovieDB, sort_by: str) -> str:
+        """Build the cursor that resumes a listing sorted by sort_by after movie."""
+        value = getattr(movie, self._sort_column(sort_by).key)
+        return base64.urlsafe_b64encode(orjson.dumps([value, movie.id])).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort_column) -> tuple:
+        """Parse a cursor back into (sort value, movie id)."""
+        try:
+            value, movie_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+            if value is not None:
+                python_type = sort_column.type.python_type
+                if python_type in (date, datetime):
+                    value = python_type.fromisoformat(value)
+            return value, int(movie_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @staticmethod
+    def _after(sort_column, value, movie_id: int, descending: bool):
+        """Condition selecting rows that sort after (value, movie_id)."""
+        # NULLs sort last when descending and first when ascending
+        if descending:
+            if value is None:
+                return and_(sort_column.is_(None), MovieDB.id < movie_id)
+            return or_(
+                sort_column < value,
+                and_(sort_column == value, MovieDB.id < movie_id),
+                sort_column.is_(None),
+            )
+        if value is None:
+            return or_(
+                and_(sort_column.is_(None), MovieDB.id > movie_id),
+                sort_column.isnot(None),
+            )
+        return or_(
+            sort_column > value,
+            and_(sort_column == value, MovieDB.id > movie_id),
+        )
 
+    def iter_movies(
+        self,
+        watched: Optional[bool] = None,
+        watchlist: Optional[bool] = None,
+        batch_size: int = 500,
+    ) -> Iterator[MovieDB]:
+        """Iterate over movies, most recently watched first, loading rows in batches."""
+        with self.get_session() as session:
+            query = select(MovieDB)
             if watched is not None:
-                query = query.filter(MovieDB.is_watched == watched)
+                query = query.where(MovieDB.is_watched == watched)
             if watchlist is not None:
-                query = query.filter(MovieDB.is_watchlist == watchlist)
-            if search:
-                query = query.filter(MovieDB.title.ilike(f"%{search}%"))
-            if year:
-                query = query.filter(MovieDB.year == year)
-            if min_rating is not None:
-                query = query.filter(MovieDB.rating >= min_rating)
-            if max_rating is not None:
-                query = query.filter(MovieDB.rating <= max_rating)
-
-            # Sorting
-            sort_column = getattr(MovieDB, sort_by, MovieDB.watched_date)
-            if sort_order == "desc":
-                query = query.order_by(sort_column.desc().nullslast())
-            else:
-                query = query.order_by(sort_column.asc().nullsfirst())
-
-            return query.offset(offset).limit(limit).all()
-
-    def get_movie_by_id(self, movie_id: int) -> Optional[MovieDB]:
+                query = query.where(MovieDB.is_watchlist == watchlist)
+            query = query.order_by(MovieDB.watched_date.desc().nullslast())
+
+            yield from session.scalars(query.execution_options(yield_per=batch_size))
+
+    def get_movie_by_id(
+        self, movie_id: int, session: Optional[Session] = None
+    ) -> Optional[MovieDB]:
         """Get a single movie by ID."""
-        with self.get_session() as session:
-            return session.query(MovieDB).filter(MovieDB.id == movie_id).first()
+        with self._use_session(session) as session:
+            return session.get(MovieDB, movie_id)
 
-    def get_movie_by_tmdb_id(self, tmdb_id: int) -> Optional[MovieDB]:
+    def get_movie_by_tmdb_id(
+        self, tmdb_id: int, session: Optional[Session] = None
+    ) -> Optional[MovieDB]:
         """Get a movie by TMDB ID."""
-        with self.get_session() as session:
-            return session.query(MovieDB).filter(MovieDB.tmdb_id == tmdb_id).first()
+        with self._use_session(session) as session:
+            return session.scalar(select(MovieDB).where(MovieDB.tmdb_id == tmdb_id).limit(1))
 
     def upsert_movie(self, movie_data: dict) -> MovieDB:
         """Insert or update a movie."""
         with self.get_session() as session:
-            # Try to find existing movie
-            existing = None
-            if movie_data.get("tmdb_id"):
-                existing = session.query(MovieDB).filter(
-                    MovieDB.tmdb_id == movie_data["tmdb_id"]
-                ).first()
-            elif movie_data.get("imdb_id"):
-                existing = session.query(MovieDB).filter(
-                    MovieDB.imdb_id == movie_data["imdb_id"]
-                ).first()
+            movie = self._upsert_in(session, movie_data)
+            session.commit()
+            return movie
+
+    @staticmethod
+    def _upsert_in(session: Session, movie_data: dict) -> MovieDB:
+        """Insert or update a movie in the caller's transaction."""
+        # Try to find existing movie
+        existing = None
+        if movie_data.get("tmdb_id"):
+            existing = session.query(MovieDB).filter(
+                MovieDB.tmdb_id == movie_data["tmdb_id"]
+            ).first()
+        elif movie_data.get("imdb_id"):
+            existing = session.query(MovieDB).filter(
+                MovieDB.imdb_id == movie_data["imdb_id"]
+            ).first()
+
+        if existing:
+            # Update existing
+            for key, value in movie_data.items():
+                if hasattr(existing, key) and value is not None:
+                    setattr(existing, key, value)
+            return existing
+
+        # Create new
+        movie = MovieDB(**movie_data)
+        session.add(movie)
+        return movie
+
+    def bulk_upsert_movies(self, rows: list[dict]) -> None:
+        """
+        Insert or update many movies in one transaction.
+
+        Rows are matched on tmdb_id with SQLite's native UPSERT and, like
+        upsert_movie, only overwrite columns with non-None values. Movies
+        whose stored row would come out unchanged are not written at all.
+        Rows without a TMDB ID go through upsert_movie's IMDB lookup instead,
+        in the same transaction.
+        """
+        with self.get_session() as session:
+            # Take the write lock up front: the change check reads before
+            # writing, and a deferred transaction cannot upgrade to a write
+            # once another connection has committed in between
+            session.execute(text("BEGIN IMMEDIATE"))
+
+            by_tmdb_id: dict[int, list[dict]] = {}
+            for row in rows:
+                if row.get("tmdb_id"):
+                    by_tmdb_id.setdefault(row["tmdb_id"], []).append(row)
+                else:
+                    self._upsert_in(session, row)
+
+            changed = self._changed_tmdb_ids(session, by_tmdb_id) if by_tmdb_id else set()
+
+            # executemany needs the same keys in every row, so group by key set
+            by_columns: dict[tuple, list[dict]] = {}
+            for row in rows:
+                if row.get("tmdb_id") in changed:
+                    by_columns.setdefault(tuple(row), []).append(row)
+
+            for columns, group in by_columns.items():
+                session.execute(_upsert_statement(columns), group)
+            session.commit()
 
-            if existing:
-                # Update existing
-                for key, value in movie_data.items():
-                    if hasattr(existing, key) and value is not None:
-                        setattr(existing, key, value)
-                session.commit()
-                session.refresh(existing)
-                return existing
-            else:
-                # Create new
-                movie = MovieDB(**movie_data)
-                session.add(movie)
-                session.commit()
-                session.refresh(movie)
-                return movie
+    @staticmethod
+    def _changed_tmdb_ids(session: Session, by_tmdb_id: dict[int, list[dict]]) -> set[int]:
+        """TMDB IDs whose stored row differs from the result of applying their rows."""
+        columns = {key for group in by_tmdb_id.values() for row in group for key in row}
+        table = MovieDB.__table__
+        query = select(*(table.c[key] for key in columns))
+
+        # Read only the movies being written, in chunks under SQLite's
+        # bound-parameter limit
+        tmdb_ids = list(by_tmdb_id)
+        stored = {}
+        for start in range(0, len(tmdb_ids), CHANGE_CHECK_CHUNK):
+            chunk = tmdb_ids[start:start + CHANGE_CHECK_CHUNK]
+            for row in session.execute(query.where(table.c.tmdb_id.in_(chunk))):
+                stored[row.tmdb_id] = dict(row._mapping)
+
+        changed = set()
+        for tmdb_id, group in by_tmdb_id.items():
+            current = stored.get(tmdb_id)
+            if current is None:
+                changed.add(tmdb_id)
+                continue
+            # Rows apply in order, so compare the end state rather than each row
+            merged = current.copy()
+            for row in group:
+                merged.update((key, value) for key, value in row.items() if value is not None)
+            if merged != current:
+                changed.add(tmdb_id)
+        return changed
 
     def update_movie(self, movie_id: int, updates: dict) -> Optional[MovieDB]:
         """Update a movie by ID."""
         with self.get_session() as session:
-            movie = session.query(MovieDB).filter(MovieDB.id == movie_id).first()
+            movie = session.get(MovieDB, movie_id)
             if movie:
                 for key, value in updates.items():
                     if hasattr(movie, key):
                         setattr(movie, key, value)
                 session.commit()
-                session.refresh(movie)
                 return movie
             return None
 
     def delete_movie(self, movie_id: int) -> bool:
         """Delete a movie by ID."""
         with self.get_session() as session:
-            movie = session.query(MovieDB).filter(MovieDB.id == movie_id).first()
+            movie = session.get(MovieDB, movie_id)
             if movie:
                 session.delete(movie)
                 session.commit()
                 return True
             return False
 
-    def get_statistics(self) -> dict:
+    def get_statistics(self, session: Optional[Session] = None) -> dict:
         """Get statistics about the movie collection."""
-        with self.get_session() as session:
-            total_watched = session.query(MovieDB).filter(MovieDB.is_watched == True).count()
-            total_watchlist = session.query(MovieDB).filter(MovieDB.is_watchlist == True).count()
-
-            # Rating distribution
-            rating_dist = {}
-            for rating in [0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]:
-                count = session.query(MovieDB).filter(
-                    MovieDB.rating == rating,
-                    MovieDB.is_watched == True
-                ).count()
-                rating_dist[str(rating)] = count
+        with self._use_session(session) as session:
+            # Totals, average rating and rating distribution in one scan
+            watched = MovieDB.is_watched == True
+            totals = session.query(
+                func.count().filter(watched),
+                func.count().filter(MovieDB.is_watchlist == True),
+                func.avg(MovieDB.rating).filter(watched),
+                *[
+                    func.count().filter(watched, MovieDB.rating == rating)
+                    for rating in RATING_STEPS
+                ],
+            ).one()
+            total_watched, total_watchlist, avg_rating, *rating_counts = totals
+            rating_dist = {
+                str(rating): count for rating, count in zip(RATING_STEPS, rating_counts)
+            }
 
             # Movies by year
             movies_by_year = (
@@ -264,12 +678,6 @@ class Database:
                 .all()
             )
 
-            # Average rating
-            avg_rating = session.query(func.avg(MovieDB.rating)).filter(
-                MovieDB.is_watched == True,
-                MovieDB.rating.isnot(None)
-            ).scalar()
-
             return {
                 "total_watched": total_watched,
                 "total_watchlist": total_watchlist,
@@ -279,10 +687,10 @@ class Database:
                 "movies_by_month": {m: c for m, c in movies_by_month if m},
             }
 
-    def get_sync_status(self) -> Optional[SyncStatus]:
+    def get_sync_status(self, session: Optional[Session] = None) -> Optional[SyncStatus]:
         """Get sync status."""
-        with self.get_session() as session:
-            status = session.query(SyncStatus).first()
+        with self._use_session(session) as session:
+            status = session.scalar(select(SyncStatus).limit(1))
             if not status:
                 status = SyncStatus()
                 session.add(status)
@@ -303,33 +711,46 @@ class Database:
 
             session.commit()
 
-    def get_years(self) -> list[int]:
+    def get_enriched_movies(self, session: Optional[Session] = None) -> dict:
+        """Movies with every TMDB-provided column filled in, keyed by TMDB ID."""
+        query = select(
+            MovieDB.tmdb_id, MovieDB.imdb_id, MovieDB.year, MovieDB.directors, MovieDB.poster_url
+        ).where(
+            MovieDB.tmdb_id.isnot(None),
+            MovieDB.imdb_id.isnot(None),
+            MovieDB.directors.isnot(None),
+            MovieDB.poster_url.isnot(None),
+        )
+        with self._use_session(session) as session:
+            return {row.tmdb_id: row for row in session.execute(query)}
+
+    def get_years(self, session: Optional[Session] = None) -> list[int]:
         """Get list of unique years."""
-        with self.get_session() as session:
-            years = (
-                session.query(MovieDB.year)
-                .filter(MovieDB.year.isnot(None))
-                .distinct()
-                .order_by(MovieDB.year.desc())
-                .all()
-            )
-            return [y[0] for y in years]
+        query = (
+            select(MovieDB.year)
+            .where(MovieDB.year.isnot(None))
+            .distinct()
+            .order_by(MovieDB.year.desc())
+        )
+        with self._use_session(session) as session:
+            return list(session.scalars(query))
 
     def count_movies(
         self,
         watched: Optional[bool] = None,
         watchlist: Optional[bool] = None,
         search: Optional[str] = None,
+        session: Optional[Session] = None,
     ) -> int:
         """Count movies with filters."""
-        with self.get_session() as session:
-            query = session.query(func.count(MovieDB.id))
+        query = select(func.count(MovieDB.id))
 
-            if watched is not None:
-                query = query.filter(MovieDB.is_watched == watched)
-            if watchlist is not None:
-                query = query.filter(MovieDB.is_watchlist == watchlist)
-            if search:
-                query = query.filter(MovieDB.title.ilike(f"%{search}%"))
+        if watched is not None:
+            query = query.where(MovieDB.is_watched == watched)
+        if watchlist is not None:
+            query = query.where(MovieDB.is_watchlist == watchlist)
+        if search:
+            query = query.where(self._title_matches(search))
 
-            return query.scalar() or 0
+        with self._use_session(session) as session:
+            return session.scalar(query) or 0
@@ -1,13 +1,18 @@
 """Background sync service to monitor Simkl for changes."""
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from typing import Callable, Optional
 
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from src.config import Config
 from src.enrichment.tmdb import TMDBClient
+from src.models import Movie, WatchEntry, WatchlistEntry
 from src.web.database import Database
 
 logger = logging.getLogger(__name__)
@@ -16,6 +21,9 @@ logger = logging.getLogger(__name__)
 class SyncService:
     """Background service to sync movies from the configured source."""
 
+    POSTER_BASE_URL = "https://image.tmdb.org/t/p/w300"
+    SYNC_WINDOW = 500  # Watched movies enriched and written per step
+
     def __init__(
         self,
         database: Database,
@@ -23,12 +31,16 @@ class SyncService:
     ):
         self.db = database
         self.on_sync_complete = on_sync_complete
-        self.scheduler = BackgroundScheduler()
-        self._is_syncing = False
+        # Only the sync job runs here, so one worker thread is all it needs
+        self.scheduler = BackgroundScheduler(executors={"default": SchedulerExecutor(1)})
+        # Held for the whole sync; scheduled and manual syncs both take it
+        self._sync_lock = threading.Lock()
 
         # Initialize clients
         self.source = self._create_source()
-        self.tmdb = TMDBClient(Config.TMDB_API_KEY)
+        self.tmdb = TMDBClient(Config.TMDB_API_KEY, max_workers=Config.TMDB_CONCURRENCY)
+        # Movies enriched by earlier runs cost no TMDB request after a restart
+        self.tmdb.load_cache(Config.ENRICHMENT_CACHE_FILE)
 
     def _create_source(self):
         """Create the appropriate data source based on PRIMARY_SOURCE config."""
@@ -66,6 +78,8 @@ class SyncService:
             minutes=interval_minutes,
             id="sync_simkl",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,  # A sync that ran long triggers one catch-up run, not several
         )
         self.scheduler.start()
         logger.info(f"Sync service started (interval: {interval_minutes} min)")
@@ -73,95 +87,95 @@ class SyncService:
     def stop(self) -> None:
         """Stop the sync scheduler."""
         self.scheduler.shutdown(wait=False)
+        # Drop the pooled keep-alive connections held by the HTTP clients
+        self.tmdb.close()
+        self.source.close()
         logger.info("Sync service stopped")
 
     def sync(self) -> dict:
         """Perform a full sync with Simkl."""
-        if self._is_syncing:
+        if not self._sync_lock.acquire(blocking=False):
             logger.warning("Sync already in progress, skipping")
             return {"status": "skipped", "reason": "already syncing"}
 
-        self._is_syncing = True
-        self.db.update_sync_status(status="syncing", error_message=None)
-
+        # Set once a window is committed, so a failure after it still
+        # invalidates what was cached from the old rows
+        written = False
         try:
+            self.db.update_sync_status(status="syncing", error_message=None)
             logger.info(f"Starting sync from {self.source.name}...")
 
             # Test connection
             if not self.source.test_connection():
                 raise Exception(f"Failed to connect to {self.source.name}")
 
-            # Get watched movies
-            watched_entries = self.source.get_watched()
-            logger.info(f"Fetched {len(watched_entries)} watched movies")
+            # Nothing to fetch if the source reports no change since last time
+            last_activity = self.source.get_last_activity()
+            if last_activity and last_activity == self.db.get_sync_status().last_activity:
+                logger.info(f"No changes on {self.source.name} since the last sync")
+                self.db.update_sync_status(last_sync=datetime.utcnow(), status="idle")
+                # No movie changed, so cached pages and ETags stay valid
+                return {"status": "skipped", "reason": "unchanged"}
+
+            # Movies stored complete by an earlier sync need no TMDB lookup
+            known = self.db.get_enriched_movies()
+            known_by_imdb = {row.imdb_id: row for row in known.values()}
 
-            # Get watchlist
-            watchlist_entries = self.source.get_watchlist()
+            # Watched movies are processed a window at a time, so only one
+            # window of entries and rows is alive at once. The first window is
+            # read while the watchlist is fetched; test_connection has already
+            # authenticated, so the two calls share no setup.
+            watched = self.source.iter_watched()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                watchlist_future = executor.submit(self.source.get_watchlist)
+                window = list(islice(watched, self.SYNC_WINDOW))
+                watchlist_entries = watchlist_future.result()
             logger.info(f"Fetched {len(watchlist_entries)} watchlist movies")
 
-            # Process watched movies
-            watched_count = 0
-            for entry in watched_entries:
-                # Enrich with TMDB
-                entry.movie = self.tmdb.enrich_movie(entry.movie)
-
-                # Get poster URL
-                poster_url = None
-                if entry.movie.tmdb_id:
-                    details = self.tmdb.get_movie_details(entry.movie.tmdb_id)
-                    if details and details.get("poster_path"):
-                        poster_url = f"https://image.tmdb.org/t/p/w300{details['poster_path']}"
-
-                # Upsert to database
-                movie_data = {
-                    "tmdb_id": entry.movie.tmdb_id,
-                    "imdb_id": entry.movie.imdb_id,
-                    "title": entry.movie.title,
-                    "year": entry.movie.year,
-                    "directors": ", ".join(entry.movie.directors) if entry.movie.directors else None,
-                    "poster_url": poster_url,
-                    "watched_date": entry.watched_date,
-                    "rating": entry.rating,
-                    "rewatch": entry.rewatch,
-                    "is_watched": True,
-                    "is_watchlist": False,
-                    "source": Config.PRIMARY_SOURCE,
-                }
-                self.db.upsert_movie(movie_data)
-                watched_count += 1
-
-            # Process watchlist
-            watchlist_count = 0
+            # The watchlist is enriched first so watched movies can be matched
+            # against it, by any ID the movie has
+            poster_urls = self._enrich_entries(watchlist_entries, known, known_by_imdb)
+            watchlist_rows: dict[tuple, dict] = {}
+            watchlist_index: dict[tuple, tuple] = {}
             for entry in watchlist_entries:
-                # Enrich with TMDB
-                entry.movie = self.tmdb.enrich_movie(entry.movie)
-
-                # Get poster URL
-                poster_url = None
-                if entry.movie.tmdb_id:
-                    details = self.tmdb.get_movie_details(entry.movie.tmdb_id)
-                    if details and details.get("poster_path"):
-                        poster_url = f"https://image.tmdb.org/t/p/w300{details['poster_path']}"
-
-                movie_data = {
-                    "tmdb_id": entry.movie.tmdb_id,
-                    "imdb_id": entry.movie.imdb_id,
-                    "title": entry.movie.title,
-                    "year": entry.movie.year,
-                    "directors": ", ".join(entry.movie.directors) if entry.movie.directors else None,
-                    "poster_url": poster_url,
-                    "is_watched": False,
-                    "is_watchlist": True,
-                    "source": Config.PRIMARY_SOURCE,
-                }
-                self.db.upsert_movie(movie_data)
-                watchlist_count += 1
+                keys = self._movie_keys(entry.movie)
+                watchlist_rows[keys[0]] = self._movie_row(entry, poster_urls)
+                for key in keys:
+                    watchlist_index.setdefault(key, keys[0])
+            watchlist_count = len(watchlist_entries)
+
+            # A movie on both lists is written once, with both flags
+            also_watched = set()
+            watched_count = 0
+            while window:
+                poster_urls = self._enrich_entries(window, known, known_by_imdb)
+                rows: dict[tuple, dict] = {}
+                for entry in window:
+                    keys = self._movie_keys(entry.movie)
+                    movie_data = self._movie_row(entry, poster_urls)
+                    match = next((watchlist_index[k] for k in keys if k in watchlist_index), None)
+                    if match:
+                        movie_data["is_watchlist"] = True
+                        also_watched.add(match)
+                    rows[keys[0]] = movie_data
+                self.db.bulk_upsert_movies(list(rows.values()))
+                written = True
+                watched_count += len(window)
+                window = list(islice(watched, self.SYNC_WINDOW))
+            logger.info(f"Fetched {watched_count} watched movies")
+
+            self.db.bulk_upsert_movies([
+                movie_data for key, movie_data in watchlist_rows.items()
+                if key not in also_watched
+            ])
+            self._save_enrichment_cache()
 
             # Update sync status
             self.db.update_sync_status(
                 last_sync=datetime.utcnow(),
                 movies_count=watched_count,
                 watchlist_count=watchlist_count,
+                last_activity=last_activity,
                 status="idle",
             )
 
@@ -185,11 +199,109 @@ class SyncService:
                 status="error",
                 error_message=str(e),
             )
-            return {"status": "error", "error": str(e)}
+            result = {"status": "error", "error": str(e)}
+            if written and self.on_sync_complete:
+                self.on_sync_complete(result)
+            return result
 
         finally:
-            self._is_syncing = False
+            self._sync_lock.release()
+
+    def _enrich_entries(self, entries: list, known: dict, known_by_imdb: dict) -> dict[int, str]:
+        """
+        Fill in TMDB data on entries in place and return their poster URLs.
+
+        Movies stored complete by an earlier sync take their data from the
+        database; the rest are enriched in one concurrent batch.
+        """
+        poster_urls = {}
+        to_enrich = []
+        for entry in entries:
+            row = known.get(entry.movie.tmdb_id) or known_by_imdb.get(entry.movie.imdb_id)
+            if row:
+                entry.movie = Movie(
+                    title=entry.movie.title,
+                    year=row.year or entry.movie.year,
+                    tmdb_id=row.tmdb_id,
+                    imdb_id=row.imdb_id,
+                    directors=row.directors.split(", "),
+                )
+                poster_urls[row.tmdb_id] = row.poster_url
+            else:
+                to_enrich.append(entry)
+
+        if to_enrich:
+            logger.info(f"Enriching {len(to_enrich)} new or incomplete movies")
+            # enrich_many keeps order
+            movies = self.tmdb.enrich_many(entry.movie for entry in to_enrich)
+            for entry, movie in zip(to_enrich, movies):
+                entry.movie = movie
+            poster_urls.update(self._poster_urls(movies))
+        return poster_urls
+
+    @staticmethod
+    def _movie_keys(movie: Movie) -> list[tuple]:
+        """
+        Keys identifying a movie across the two lists, most specific first.
+
+        Explicit rather than Movie's hash/equality, which disagree when only
+        one side has a TMDB ID.
+        """
+        keys = []
+        if movie.tmdb_id:
+            keys.append(("tmdb", movie.tmdb_id))
+        if movie.imdb_id:
+            keys.append(("imdb", movie.imdb_id))
+        return keys or [("title", movie.title.lower(), movie.year)]
+
+    def _save_enrichment_cache(self) -> None:
+        """Persist TMDB lookups for the next sync."""
+        self.tmdb.save_cache(Config.ENRICHMENT_CACHE_FILE)
+
+    def _poster_urls(self, movies: list[Movie]) -> dict[int, str]:
+        """
+        Map TMDB IDs to poster URLs.
+
+        Enrichment already carries the poster path for most movies; details
+        are only fetched (concurrently) for those it resolved without one.
+        """
+        poster_paths = {m.tmdb_id: m.poster_path for m in movies if m.tmdb_id and m.poster_path}
+        missing = {m.tmdb_id for m in movies if m.tmdb_id and m.tmdb_id not in poster_paths}
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.tmdb.max_workers) as executor:
+                for tmdb_id, data in zip(missing, executor.map(self.tmdb.get_movie_details, missing)):
+                    if data and data.get("poster_path"):
+                        poster_paths[tmdb_id] = data["poster_path"]
+        base_url = self.POSTER_BASE_URL
+        return {tmdb_id: base_url + path for tmdb_id, path in poster_paths.items()}
+
+    @staticmethod
+    def _movie_row(entry: WatchEntry | WatchlistEntry, poster_urls: dict[int, str]) -> dict:
+        """
+        Build the database row for a watched or watchlist entry.
+
+        Watchlist rows leave out the watch columns, so upserting one keeps
+        the watch data and column defaults of a stored movie.
+        """
+        movie = entry.movie
+        watched = isinstance(entry, WatchEntry)
+        row = {
+            "tmdb_id": movie.tmdb_id,
+            "imdb_id": movie.imdb_id,
+            "title": movie.title,
+            "year": movie.year,
+            "directors": movie.directors_str,
+            "poster_url": poster_urls.get(movie.tmdb_id),
+            "is_watched": watched,
+            "is_watchlist": not watched,
+            "source": Config.PRIMARY_SOURCE,
+        }
+        if watched:
+            row["watched_date"] = entry.watched_date
+            row["rating"] = entry.rating
+            row["rewatch"] = entry.rewatch
+        return row
 
     @property
     def is_syncing(self) -> bool:
-        return self._is_syncing
+        return self._sync_lock.locked()